@@ -1,6 +1,7 @@
 import asyncio
+from playwright.async_api import async_playwright
 from soFIFAClubs_url_scraper import ClubURLScraper
-from soFIFAClubs_scraper import SoFIFAClubScraper
+from soFIFAClubs_scraper import SoFIFAClubScraper, launch_browser, new_http_client
 
 
 async def main():
@@ -8,18 +9,24 @@ async def main():
     print("⚽ SoFIFA Clubs Full Scraper")
     print("=" * 60)
 
-    # Step 1: Scrape club URLs
-    print("\nSTEP 1️⃣: Scraping all club URLs...")
-    url_scraper = ClubURLScraper()
-    await url_scraper.scrape_all_club_urls()
-    print("✅ Club URLs scraping done.\n")
-
-    # Step 2: Scrape club stats
-    print("STEP 2️⃣: Scraping club statistics...")
-    club_scraper = SoFIFAClubScraper()
-    club_scraper.load_urls()
-    await club_scraper.scrape_all_clubs()
-    print("✅ Club stats scraping done.\n")
+    # One Chromium process and one pooled HTTP/2 client are shared by both steps
+    async with async_playwright() as p, new_http_client() as http_client:
+        browser = await launch_browser(p)
+
+        # Step 1: Scrape club URLs
+        print("\nSTEP 1️⃣: Scraping all club URLs...")
+        url_scraper = ClubURLScraper()
+        await url_scraper.scrape_all_club_urls(browser=browser, http_client=http_client)
+        print("✅ Club URLs scraping done.\n")
+
+        # Step 2: Scrape club stats
+        print("STEP 2️⃣: Scraping club statistics...")
+        club_scraper = SoFIFAClubScraper()
+        club_scraper.load_urls()
+        await club_scraper.scrape_all_clubs(browser=browser, http_client=http_client)
+        print("✅ Club stats scraping done.\n")
+
+        await browser.close()
 
     print("=" * 60)
     print("🎉 ALL DONE — CSV files are ready!")
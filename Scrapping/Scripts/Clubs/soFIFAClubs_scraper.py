@@ -1,30 +1,73 @@
 import csv
 import os
+import re
+import random
 import asyncio
-from playwright.async_api import async_playwright
-
-
-class ClubScraper:
-    """Extracts info for one club page"""
-
-    @staticmethod
-    async def scrape_club_data(page, url):
-        """Extract all club details from one SoFIFA team page"""
-        await page.goto(url, wait_until="domcontentloaded", timeout=25000)
-        await page.wait_for_timeout(2000)
-
-        data = {"url": url}
+import itertools
+from urllib.parse import urljoin
 
-        # Run inside browser context for faster DOM access
-        club_info = await page.evaluate(
-            """
-() => {
+import httpx
+from selectolax.parser import HTMLParser
+from playwright.async_api import async_playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+# Enforce consistent column order
+FIELDNAMES = (
+    "club_id",
+    "name",
+    "league",
+    "league_id",
+    "country",
+    "rating",
+    "attack_rating",
+    "midfield_rating",
+    "defense_rating",
+    "stadium",
+    "manager",
+    "manager_id",
+    "manager_url",
+    "club_worth",
+    "starting_xi_avg_age",
+    "whole_team_avg_age",
+    "rival_team",
+    "players_count",
+    "top_players",
+    "club_logo",
+    "country_flag",
+    "url",
+)
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+# Rows buffered before the output CSV is flushed to disk
+FLUSH_EVERY = 50
+
+# Shared by every page parsed in Python
+TEAM_ID_RE = re.compile(r"/team/(\d+)/")
+COACH_RE = re.compile(r"/coach/(\d+)/([\w-]+)")
+LEAGUE_RE = re.compile(r"/league/(\d+)")
+WS_RE = re.compile(r"\s+")
+
+# Images, fonts, stylesheets and media are never needed for extraction
+BLOCKED_RESOURCES_RE = re.compile(r"\.(png|jpe?g|gif|webp|svg|woff2?|ttf|css|mp4)(\?|$)")
+
+
+# Club page extractor, installed once per context with add_init_script so each
+# page only needs a tiny evaluate() call to run it
+EXTRACTOR_JS = """
+window.__extractClub = () => {
   const d = {};
-  const clean = (t) => (t ? t.replace(/\\s+/g, " ").trim() : "");
-
-  // --- Club ID from URL ---
-  const idMatch = window.location.pathname.match(/\\/team\\/(\\d+)\\//);
-  d.club_id = idMatch ? idMatch[1] : "";
+  // Only run the collapsing regex when there is something to collapse
+  // (a whitespace run or a tab/newline/nbsp); most fields are already clean
+  const clean = (t) => {
+    if (!t) return "";
+    const s = t.trim();
+    return /\\s\\s|[^\\S ]/.test(s) ? s.replace(/\\s+/g, " ") : s;
+  };
 
   // --- Club name ---
   const name = document.querySelector("div.profile h1");
@@ -34,11 +77,10 @@ class ClubScraper:
   const logo = document.querySelector("img.crest");
   d.club_logo = logo ? (logo.dataset.src || logo.src) : "";
 
-  // --- League + League ID ---
+  // --- League (id is parsed from league_url in Python) ---
   const league = document.querySelector("div.profile p a[href*='/league/']");
   d.league = clean(league ? league.textContent : "");
-  const leagueMatch = league ? league.href.match(/\\/league\\/(\\d+)/) : null;
-  d.league_id = leagueMatch ? leagueMatch[1] : "";
+  d.league_url = league ? league.href : "";
 
   // --- Country + Flag ---
   const countryLink = document.querySelector("div.profile p a[title]");
@@ -53,85 +95,279 @@ class ClubScraper:
   d.defense_rating = "";
   const grid = document.querySelectorAll("div.grid div.col");
   grid.forEach(col => {
-    const sub = clean(col.querySelector(".sub")?.textContent || "");
+    const sub = clean(col.querySelector(".sub")?.textContent || "").toLowerCase();
     const val = clean(col.querySelector("em")?.textContent || "");
-    if (/overall/i.test(sub)) d.rating = val;
-    if (/attack/i.test(sub)) d.attack_rating = val;
-    if (/midfield/i.test(sub)) d.midfield_rating = val;
-    if (/defence|defense/i.test(sub)) d.defense_rating = val;
+    if (sub.includes("overall")) d.rating = val;
+    else if (sub.includes("attack")) d.attack_rating = val;
+    else if (sub.includes("midfield")) d.midfield_rating = val;
+    else if (sub.includes("defence") || sub.includes("defense")) d.defense_rating = val;
+  });
+
+  // --- Sidebar labels (single scan, looked up by label text) ---
+  const labelMap = {};
+  document.querySelectorAll("div.col-2 li label").forEach(l => {
+    labelMap[clean(l.textContent).toLowerCase()] = l;
   });
+  const labelValue = (key) => {
+    const l = labelMap[key];
+    return l ? clean(l.parentElement.textContent.replace(l.textContent, "")) : "";
+  };
 
   // --- Stadium ---
-  const stadium = Array.from(document.querySelectorAll("div.col-2 li label"))
-    .find(l => /Home stadium/i.test(l.textContent));
-  if (stadium) {
-    const val = stadium.nextSibling?.textContent || "";
-    d.stadium = clean(val);
-  } else {
-    d.stadium = "";
-  }
+  const stadium = labelMap["home stadium"];
+  d.stadium = clean(stadium?.nextSibling?.textContent || "");
+
+  // --- Manager (name and id are parsed from manager_url in Python) ---
+  const coachLink = document.querySelector('nav.nav-tabs a[href*="/coach/"]');
+  d.manager_url = coachLink ? coachLink.href : "";
 
-// --- Manager (from nav-tabs link) ---
-const coachLink = document.querySelector('nav.nav-tabs a[href*="/coach/"]');
-if (coachLink) {
-  const href = coachLink.getAttribute("href");
-  const coachMatch = href.match(/\\/coach\\/(\\d+)\\/([\\w-]+)/);
-  d.manager = coachMatch
-    ? coachMatch[2].replace(/-/g, " ").replace(/\b\\w/g, c => c.toUpperCase())
-    : "";
-  d.manager_id = coachMatch ? coachMatch[1] : "";
-  d.manager_url = coachLink.href;
-} else {
-  d.manager = "";
-  d.manager_id = "";
-  d.manager_url = "";
-}
-    
   // --- Club worth ---
-  const worthLi = Array.from(document.querySelectorAll("div.col-2 li label"))
-    .find(l => /Club worth/i.test(l.textContent));
-  d.club_worth = worthLi
-    ? clean(worthLi.parentElement.textContent.replace("Club worth", ""))
-    : "";
+  d.club_worth = labelValue("club worth");
 
   // --- Average ages ---
-  const xiAgeLi = Array.from(document.querySelectorAll("div.col-2 li label"))
-    .find(l => /Starting XI average age/i.test(l.textContent));
-  const teamAgeLi = Array.from(document.querySelectorAll("div.col-2 li label"))
-    .find(l => /Whole team average age/i.test(l.textContent));
-  d.starting_xi_avg_age = xiAgeLi
-    ? clean(xiAgeLi.parentElement.textContent.replace("Starting XI average age", ""))
-    : "";
-  d.whole_team_avg_age = teamAgeLi
-    ? clean(teamAgeLi.parentElement.textContent.replace("Whole team average age", ""))
-    : "";
+  d.starting_xi_avg_age = labelValue("starting xi average age");
+  d.whole_team_avg_age = labelValue("whole team average age");
 
   // --- Rival club ---
-  const rivalLi = Array.from(document.querySelectorAll("div.col-2 li label"))
-    .find(l => /Rival team/i.test(l.textContent));
-  d.rival_team = rivalLi
-    ? clean(rivalLi.parentElement.textContent.replace("Rival team", ""))
-    : "";
+  d.rival_team = labelValue("rival team");
 
   // --- Players (from lineup field baskets) ---
   const playerLinks = document.querySelectorAll("div.field-basket ul a[href*='/player/']");
-  const players = Array.from(playerLinks).map(a => clean(a.textContent)).filter(Boolean);
-  d.players_count = players.length;
-  d.top_players = players.slice(0, 5).join(", ");
+  const playerNames = [];
+  for (let i = 0; i < playerLinks.length && playerNames.length < 5; i++) {
+    const t = clean(playerLinks[i].textContent);
+    if (t) playerNames.push(t);
+  }
+  d.players_count = playerLinks.length;
+  d.top_players = playerNames.join(", ");
 
   return d;
-}
+};
 """
-        )
 
+
+def new_http_client():
+    """HTTP/2 client with a pooled connection to sofifa.com, meant to be shared for a whole run"""
+    return httpx.AsyncClient(
+        http2=True,
+        headers={"User-Agent": USER_AGENT},
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+        timeout=httpx.Timeout(10.0, connect=5.0),
+    )
+
+
+async def launch_browser(p):
+    """Launch the headless Chromium shared by all scraping steps"""
+    return await p.chromium.launch(
+        headless=True,
+        chromium_sandbox=False,
+        args=[
+            "--disable-blink-features=AutomationControlled",
+            "--disable-dev-shm-usage",
+            "--no-sandbox",
+            "--disable-setuid-sandbox",
+            # Trim per-context memory so more pages can run concurrently
+            "--disable-gpu",
+            "--disable-extensions",
+            "--disable-background-networking",
+            "--disable-sync",
+            "--disable-translate",
+            "--metrics-recording-only",
+            "--mute-audio",
+            "--no-first-run",
+            "--renderer-process-limit=1",
+            "--js-flags=--max-old-space-size=256",
+        ],
+    )
+
+
+async def new_context(browser):
+    """Create an isolated browser context with the scraper headers and resource blocking"""
+    context = await browser.new_context(
+        user_agent=USER_AGENT,
+        viewport={"width": 1920, "height": 1080},
+        locale="en-US",
+        timezone_id="America/New_York",
+    )
+
+    # Registered once on the context so it covers every page opened in it.
+    # Only URLs matching the pattern are intercepted, so HTML/XHR/JS requests
+    # never round-trip to Python.
+    await context.route(BLOCKED_RESOURCES_RE, lambda route: route.abort())
+    return context
+
+
+async def goto_with_retry(page, url, tries=3, **kwargs):
+    """Navigate to url, retrying timeouts with exponential backoff and jitter
+
+    Returns the navigation response. HTTP errors such as 404 are returned as-is
+    (not retried) so the caller can decide what to do with them.
+    """
+    for attempt in range(tries):
+        try:
+            return await page.goto(url, **kwargs)
+        except PlaywrightTimeoutError:
+            if attempt == tries - 1:
+                raise
+            backoff = min(2 ** attempt + random.random(), 15)
+            print(f"⚠️ Timeout on {url}, retrying in {backoff:.1f}s...")
+            await asyncio.sleep(backoff)
+
+
+def _clean(text):
+    """Collapse whitespace like the browser extractor's clean()"""
+    return WS_RE.sub(" ", text).strip() if text else ""
+
+
+def _text(node):
+    return _clean(node.text()) if node is not None else ""
+
+
+def _img_src(node, base_url):
+    if node is None:
+        return ""
+    src = node.attributes.get("data-src") or node.attributes.get("src") or ""
+    return urljoin(base_url, src) if src else ""
+
+
+class ClubScraper:
+    """Extracts info for one club page"""
+
+    @staticmethod
+    def add_url_ids(d, url):
+        """Fill club/league/manager ids from the page URL and extracted links"""
+        id_match = TEAM_ID_RE.search(url)
+        d["club_id"] = id_match.group(1) if id_match else ""
+
+        league_match = LEAGUE_RE.search(d.pop("league_url", ""))
+        d["league_id"] = league_match.group(1) if league_match else ""
+
+        # Manager name is the URL slug, lowercase (e.g. "arne slot")
+        coach_match = COACH_RE.search(d.get("manager_url", ""))
+        d["manager"] = coach_match.group(2).replace("-", " ") if coach_match else ""
+        d["manager_id"] = coach_match.group(1) if coach_match else ""
+        return d
+
+    @staticmethod
+    def parse_club_html(html, url):
+        """Python port of EXTRACTOR_JS for server-rendered team pages
+
+        Returns None when the page has no club profile (e.g. an anti-bot page).
+        """
+        tree = HTMLParser(html)
+        name = tree.css_first("div.profile h1")
+        if name is None:
+            return None
+
+        d = {}
+
+        # --- Club name / logo ---
+        d["name"] = _text(name)
+        d["club_logo"] = _img_src(tree.css_first("img.crest"), url)
+
+        # --- League ---
+        league = tree.css_first("div.profile p a[href*='/league/']")
+        d["league"] = _text(league)
+        d["league_url"] = urljoin(url, league.attributes.get("href") or "") if league else ""
+
+        # --- Country + Flag ---
+        country_link = tree.css_first("div.profile p a[title]")
+        d["country"] = _clean(country_link.attributes.get("title")) if country_link else ""
+        d["country_flag"] = _img_src(tree.css_first("div.profile p img.flag"), url)
+
+        # --- Overall / Attack / Midfield / Defence ---
+        d["rating"] = d["attack_rating"] = d["midfield_rating"] = d["defense_rating"] = ""
+        for col in tree.css("div.grid div.col"):
+            sub = _text(col.css_first(".sub")).lower()
+            val = _text(col.css_first("em"))
+            if "overall" in sub:
+                d["rating"] = val
+            elif "attack" in sub:
+                d["attack_rating"] = val
+            elif "midfield" in sub:
+                d["midfield_rating"] = val
+            elif "defence" in sub or "defense" in sub:
+                d["defense_rating"] = val
+
+        # --- Sidebar labels ---
+        labels = {_text(l).lower(): l for l in tree.css("div.col-2 li label")}
+
+        def label_value(key):
+            label = labels.get(key)
+            if label is None or label.parent is None:
+                return ""
+            return _clean(label.parent.text().replace(label.text(), "", 1))
+
+        stadium = labels.get("home stadium")
+        d["stadium"] = _clean(stadium.next.text()) if stadium is not None and stadium.next is not None else ""
+
+        # --- Manager (from nav-tabs link) ---
+        coach_link = tree.css_first('nav.nav-tabs a[href*="/coach/"]')
+        d["manager_url"] = urljoin(url, coach_link.attributes.get("href") or "") if coach_link else ""
+
+        d["club_worth"] = label_value("club worth")
+        d["starting_xi_avg_age"] = label_value("starting xi average age")
+        d["whole_team_avg_age"] = label_value("whole team average age")
+        d["rival_team"] = label_value("rival team")
+
+        # --- Players (from lineup field baskets) ---
+        player_links = tree.css("div.field-basket ul a[href*='/player/']")
+        player_names = []
+        for a in player_links:
+            if len(player_names) == 5:
+                break
+            t = _text(a)
+            if t:
+                player_names.append(t)
+        d["players_count"] = len(player_links)
+        d["top_players"] = ", ".join(player_names)
+
+        return ClubScraper.add_url_ids(d, url)
+
+    @staticmethod
+    async def fetch_club_data(client, url):
+        """Fast path: fetch the raw team page over HTTP and parse it
+
+        Returns None if the response looks blocked, so the caller can fall
+        back to a real browser.
+        """
+        resp = await client.get(url)
+        if resp.status_code == 404:
+            raise RuntimeError(f"HTTP 404 for {url}")
+        if resp.status_code != 200 or "Just a moment" in resp.text:
+            return None
+
+        club_info = ClubScraper.parse_club_html(resp.text, url)
+        if club_info is None:
+            return None
+
+        data = {"url": url}
         data.update(club_info)
         return data
 
+    @staticmethod
+    async def scrape_club_data(page, url):
+        """Extract all club details from one SoFIFA team page"""
+        response = await goto_with_retry(page, url, wait_until="commit", timeout=25000)
+        if response is not None and response.status == 404:
+            raise RuntimeError(f"HTTP 404 for {url}")
+        # Wait only until the profile header the extractor reads is present
+        await page.wait_for_selector("div.profile h1", timeout=8000)
+
+        data = {"url": url}
+
+        # Extractor is preloaded on the context (see EXTRACTOR_JS)
+        club_info = await page.evaluate("() => window.__extractClub()")
+
+        data.update(ClubScraper.add_url_ids(club_info, url))
+        return data
+
 
 class SoFIFAClubScraper:
     """Main scraper that loops through all club URLs and saves to CSV"""
 
-    def __init__(self):
+    def __init__(self, max_concurrency=8):
         # Always read/write inside Scrapping/Data/Clubs/
         root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
         data_dir = os.path.join(root_dir, "Data", "Clubs")
@@ -141,108 +377,162 @@ class SoFIFAClubScraper:
         self.output_file = os.path.join(data_dir, "club_stats.csv")
 
         self.club_urls = []
-        self.results = []
+        # Rows live in the CSV only; keep a count for reporting
+        self.results_count = 0
 
+        self._csv_fh = None
+        self._writer = None
+        self._pending_rows = 0
+        self._header_written = os.path.exists(self.output_file) and os.path.getsize(self.output_file) > 0
 
-    def load_urls(self):
-        """Load all club URLs from CSV"""
-        with open(self.urls_file, "r", encoding="utf-8") as f:
-            next(f)  # skip header
-            self.club_urls = [line.strip() for line in f if line.strip()]
-        print(f"✅ Loaded {len(self.club_urls)} club URLs")
+        # Number of worker coroutines scraping club pages in parallel
+        self.max_concurrency = max_concurrency
+        self._lock = asyncio.Lock()
+        self._http = None
 
-    async def scrape_all_clubs(self, limit=None):
-        """Loop through all club URLs and scrape their data"""
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-blink-features=AutomationControlled",
-                    "--disable-dev-shm-usage",
-                    "--no-sandbox",
-                    "--disable-setuid-sandbox",
-                ],
-            )
 
-            context = await browser.new_context(
-                user_agent=(
-                    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/120.0.0.0 Safari/537.36"
-                ),
-                viewport={"width": 1920, "height": 1080},
-                locale="en-US",
-                timezone_id="America/New_York",
-            )
+    def iter_urls(self):
+        """Lazily yield club URLs from CSV"""
+        with open(self.urls_file, "r", newline="", encoding="utf-8", buffering=1 << 20) as f:
+            reader = csv.reader(f)
+            next(reader, None)  # skip header
+            for row in reader:
+                if row and row[0].strip():
+                    yield row[0].strip()
+
+    def load_urls(self):
+        """Load all club URLs from CSV, skipping clubs already in the output CSV"""
+        self.club_urls = list(self.iter_urls())
+        print(f"✅ Loaded {len(self.club_urls)} club URLs")
 
+        if os.path.exists(self.output_file):
+            with open(self.output_file, "r", newline="", encoding="utf-8") as f:
+                done = {row["url"] for row in csv.DictReader(f) if row.get("url")}
+            if done:
+                self.club_urls = [u for u in self.club_urls if u not in done]
+                print(f"Resuming: {len(done)} already done, {len(self.club_urls)} remaining")
+
+    async def _scrape_with_browser(self, browser, url):
+        """Scrape one club in its own browser context"""
+        context = await new_context(browser)
+        await context.add_init_script(EXTRACTOR_JS)
+        try:
             page = await context.new_page()
-            await page.route(
-                "**/*",
-                lambda route: (
-                    route.abort()
-                    if route.request.resource_type
-                    in ["image", "font", "stylesheet", "media"]
-                    else route.continue_()
-                ),
+            return await ClubScraper.scrape_club_data(page, url)
+        finally:
+            await context.close()
+
+    async def _scrape_one(self, browser, url, idx, total):
+        """Scrape one club (HTTP first, browser if blocked)"""
+        print(f"[{idx}/{total}] Scraping {url}")
+
+        try:
+            data = None
+            try:
+                data = await ClubScraper.fetch_club_data(self._http, url)
+            except httpx.HTTPError as e:
+                print(f"  ⚠️ HTTP error on {url}: {e}")
+            if data is None:
+                data = await self._scrape_with_browser(browser, url)
+
+            # Counter and CSV file are shared between workers
+            async with self._lock:
+                self.results_count += 1
+                self.save_to_csv(data)
+            print(
+                f"  ✓ {data.get('name', 'Unknown Club')} ({data.get('league', 'Unknown League')})"
             )
 
-            to_scrape = self.club_urls[:limit] if limit else self.club_urls
-            total = len(to_scrape)
+        except Exception as e:
+            print(f"  ✗ Error scraping {url}: {e}")
 
-            for idx, url in enumerate(to_scrape, 1):
-                print(f"[{idx}/{total}] Scraping {url}")
+    async def _worker(self, browser, queue, total):
+        """Scrape queued (idx, url) pairs until a None sentinel arrives"""
+        while (item := await queue.get()) is not None:
+            idx, url = item
+            await self._scrape_one(browser, url, idx, total)
 
+    @staticmethod
+    async def _produce(queue, urls, n_workers):
+        """Feed URLs to the workers, then one sentinel per worker"""
+        for item in enumerate(urls, 1):
+            await queue.put(item)
+        for _ in range(n_workers):
+            await queue.put(None)
+
+    async def scrape_all_clubs(self, limit=None, browser=None, http_client=None):
+        """Scrape all club URLs with max_concurrency workers fed from a queue
+
+        Pass an already launched ``browser`` and/or an ``http_client`` from
+        new_http_client() to reuse them; otherwise they are created (and
+        closed) just for this call.
+        """
+        if browser is None:
+            async with async_playwright() as p:
+                browser = await launch_browser(p)
                 try:
-                    data = await ClubScraper.scrape_club_data(page, url)
-                    self.results.append(data)
-                    self.save_to_csv(data)
-                    print(
-                        f"  ✓ {data.get('name', 'Unknown Club')} ({data.get('league', 'Unknown League')})"
-                    )
+                    await self.scrape_all_clubs(limit=limit, browser=browser, http_client=http_client)
+                finally:
+                    await browser.close()
+            return
+
+        if http_client is None:
+            async with new_http_client() as http_client:
+                await self.scrape_all_clubs(limit=limit, browser=browser, http_client=http_client)
+            return
+
+        to_scrape = itertools.islice(self.club_urls, limit)
+        total = min(limit, len(self.club_urls)) if limit else len(self.club_urls)
+
+        self._http = http_client
+        self.open_csv()
+
+        # Bounded queue keeps at most a couple of URLs per worker in flight
+        queue = asyncio.Queue(maxsize=2 * self.max_concurrency)
+        # Start every worker before queuing so the first requests go out immediately
+        workers = [
+            asyncio.create_task(self._worker(browser, queue, total))
+            for _ in range(self.max_concurrency)
+        ]
+        try:
+            await self._produce(queue, to_scrape, len(workers))
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            self.close()
+
+        print(f"\n✅ Finished scraping {self.results_count} clubs")
+        print(f"💾 Results saved to: {self.output_file}")
 
-                except Exception as e:
-                    print(f"  ✗ Error scraping {url}: {e}")
+    def iter_results(self):
+        """Yield scraped club rows back from the output CSV"""
+        with open(self.output_file, "r", newline="", encoding="utf-8") as f:
+            yield from csv.DictReader(f)
 
-            await browser.close()
-
-        print(f"\n✅ Finished scraping {len(self.results)} clubs")
-        print(f"💾 Results saved to: {self.output_file}")
+    def open_csv(self):
+        """Open the output CSV once and keep the writer for the whole run"""
+        self._csv_fh = open(self.output_file, "a", newline="", encoding="utf-8", buffering=1 << 16)
+        self._writer = csv.DictWriter(self._csv_fh, fieldnames=FIELDNAMES)
+        self._pending_rows = 0
 
     def save_to_csv(self, data):
-        """Append one club to the CSV file"""
-        file_exists = os.path.isfile(self.output_file)
-
-        # Enforce consistent column order
-        fieldnames = [
-            "club_id",
-            "name",
-            "league",
-            "league_id",
-            "country",
-            "rating",
-            "attack_rating",
-            "midfield_rating",
-            "defense_rating",
-            "stadium",
-            "manager",
-            "manager_id",
-            "manager_url",
-            "club_worth",
-            "starting_xi_avg_age",
-            "whole_team_avg_age",
-            "rival_team",
-            "players_count",
-            "top_players",
-            "club_logo",
-            "country_flag",
-            "url",
-        ]
-
-        with open(self.output_file, "a", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            if not file_exists:
-                writer.writeheader()
-            writer.writerow(data)
+        """Append one club to the CSV file (flushed every FLUSH_EVERY rows)"""
+        if not self._header_written:
+            self._writer.writeheader()
+            self._header_written = True
+        self._writer.writerow(data)
+        self._pending_rows += 1
+        if self._pending_rows >= FLUSH_EVERY:
+            self._csv_fh.flush()
+            self._pending_rows = 0
+
+    def close(self):
+        """Flush remaining rows and close the output CSV"""
+        if self._csv_fh is not None:
+            self._csv_fh.close()
+            self._csv_fh = None
+            self._writer = None
 
 
 async def main():
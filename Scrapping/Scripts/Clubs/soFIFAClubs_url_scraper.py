@@ -1,119 +1,152 @@
 import csv
 import asyncio
+from urllib.parse import urljoin
+
+import httpx
+from selectolax.parser import HTMLParser
 from playwright.async_api import async_playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from soFIFAClubs_scraper import goto_with_retry, launch_browser, new_context, new_http_client
 import os
 
 class ClubURLScraper:
-    def __init__(self, base_url="https://sofifa.com/teams?type=club&col=rating&sort=desc"):
+    def __init__(self, base_url="https://sofifa.com/teams?type=club&col=rating&sort=desc", max_concurrency=4):
         self.base_url = base_url
         self.all_club_urls = []
         self.offset = 0
         self.page_size = 60
         self.max_offset = 660  # Last valid page
 
-    async def scrape_all_club_urls(self):
-        """Scrape all club URLs from paginated team list"""
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-blink-features=AutomationControlled",
-                    "--disable-dev-shm-usage",
-                    "--no-sandbox",
-                    "--disable-setuid-sandbox",
-                ],
-            )
-
-            context = await browser.new_context(
-                user_agent=(
-                    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/120.0.0.0 Safari/537.36"
-                ),
-                viewport={"width": 1920, "height": 1080},
-                locale="en-US",
-                timezone_id="America/New_York",
-            )
-
-            page = await context.new_page()
-
-            # Block unnecessary resources
-            await page.route(
-                "**/*",
-                lambda route: (
-                    route.abort()
-                    if route.request.resource_type
-                    in ["image", "font", "stylesheet", "media"]
-                    else route.continue_()
-                ),
-            )
-
-            page_num = 1
-
-            while self.offset <= self.max_offset:
-                url = (
-                    f"{self.base_url}&offset={self.offset}"
-                    if self.offset > 0
-                    else self.base_url
-                )
-                print(f"\n[Page {page_num}] Scraping: {url}")
-
-                # Retry logic
-                for attempt in range(2):
-                    try:
-                        await page.goto(url, wait_until="domcontentloaded", timeout=20000)
-                        break
-                    except Exception:
-                        if attempt == 0:
-                            print(f"⚠️ Timeout on {url}, retrying in 5s...")
-                            await asyncio.sleep(5)
-                        else:
-                            print(f"❌ Skipping {url} after multiple timeouts.")
-                            continue
-
-                await page.wait_for_timeout(2000)
-
-                # ✅ Extract only real team URLs inside the main table
-                club_urls = await page.evaluate(
-                    """
-                    () => {
-                        const urls = [];
-                        const rows = document.querySelectorAll('table tbody tr');
-                        rows.forEach(row => {
-                            const link = row.querySelector('a[href^="/team/"]:not([href*="random"])');
-                            if (link) {
-                                const href = link.href;
-                                if (!urls.includes(href)) {
-                                    urls.push(href);
-                                }
-                            }
-                        });
-                        return urls;
-                    }
-                    """
-                )
-
-                print(f"  ✓ Extracted {len(club_urls)} clubs")
-                self.all_club_urls.extend(club_urls)
-                self.save_urls_to_csv()
-
-                self.offset += self.page_size
-                page_num += 1
-
-            await browser.close()
+        # Keep list-page fetches polite: a few requests in flight at most
+        self.max_concurrency = max_concurrency
 
+        # Always write inside Scrapping/Data/Clubs/
+        root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        data_dir = os.path.join(root_dir, "Data", "Clubs")
+        os.makedirs(data_dir, exist_ok=True)
+        self.output_file = os.path.join(data_dir, "club_urls.csv")
+
+        self._seen = set()
+
+    def _page_url(self, offset):
+        return f"{self.base_url}&offset={offset}" if offset > 0 else self.base_url
+
+    @staticmethod
+    def parse_club_urls(html, base_url):
+        """Extract only real team URLs inside the main table"""
+        urls = []
+        for row in HTMLParser(html).css("table tbody tr"):
+            link = row.css_first('a[href^="/team/"]:not([href*="random"])')
+            if link is None:
+                continue
+            href = urljoin(base_url, link.attributes.get("href", ""))
+            if href not in urls:
+                urls.append(href)
+        return urls
+
+    async def _fetch_page_http(self, client, sem, url):
+        """Fetch one list page over plain HTTP; None means it needs a real browser"""
+        async with sem:
+            try:
+                resp = await client.get(url)
+            except httpx.HTTPError as e:
+                print(f"⚠️ HTTP error on {url}: {e}")
+                return None
+
+        if resp.status_code == 403 or "Just a moment" in resp.text:
+            print(f"⚠️ Blocked on {url} (HTTP {resp.status_code})")
+            return None
+        if resp.status_code != 200:
+            print(f"⚠️ HTTP {resp.status_code} on {url}")
+            return None
+        return self.parse_club_urls(resp.text, str(resp.url))
+
+    async def _fetch_pages_http(self, page_urls, client=None):
+        """Fetch all list pages concurrently over HTTP/2"""
+        if client is None:
+            async with new_http_client() as client:
+                return await self._fetch_pages_http(page_urls, client)
+
+        sem = asyncio.Semaphore(self.max_concurrency)
+        results = await asyncio.gather(
+            *(self._fetch_page_http(client, sem, url) for url in page_urls)
+        )
+        return dict(zip(page_urls, results))
+
+    async def _fetch_pages_playwright(self, page_urls, browser=None):
+        """Fallback for pages the HTTP client could not get past"""
+        if browser is None:
+            async with async_playwright() as p:
+                browser = await launch_browser(p)
+                try:
+                    return await self._fetch_pages_playwright(page_urls, browser)
+                finally:
+                    await browser.close()
+
+        pages = {}
+        context = await new_context(browser)
+        page = await context.new_page()
+
+        for url in page_urls:
+            print(f"\n[Playwright] Scraping: {url}")
+
+            try:
+                response = await goto_with_retry(page, url, wait_until="domcontentloaded", timeout=20000)
+            except PlaywrightTimeoutError:
+                print(f"❌ Skipping {url} after multiple timeouts.")
+                continue
+            if response is not None and response.status == 404:
+                print(f"❌ Skipping {url} (HTTP 404)")
+                continue
+
+            # Wait for the team links instead of a fixed delay
+            try:
+                await page.wait_for_selector(
+                    "table tbody tr a[href^='/team/']", timeout=8000
+                )
+            except PlaywrightTimeoutError:
+                print(f"⚠️ No team rows found on {url}")
+
+            pages[url] = self.parse_club_urls(await page.content(), url)
+
+        await context.close()
+
+        return pages
+
+    async def scrape_all_club_urls(self, browser=None, http_client=None):
+        """Scrape all club URLs from paginated team list
+
+        ``browser`` is only used if some pages need the Playwright fallback;
+        when omitted a browser is launched on demand. ``http_client`` (from
+        new_http_client()) is created for this call if not given.
+        """
+        page_urls = [
+            self._page_url(offset)
+            for offset in range(self.offset, self.max_offset + 1, self.page_size)
+        ]
+
+        # Team list is static HTML: try plain HTTP first, Chromium only if blocked
+        pages = await self._fetch_pages_http(page_urls, http_client)
+        blocked = [url for url in page_urls if pages[url] is None]
+        if blocked:
+            print(f"\n⚠️ {len(blocked)} pages blocked, falling back to Playwright")
+            pages.update(await self._fetch_pages_playwright(blocked, browser))
+
+        for page_num, url in enumerate(page_urls, 1):
+            club_urls = pages.get(url) or []
+            new_urls = [u for u in club_urls if u not in self._seen]
+            self._seen.update(new_urls)
+            print(f"[Page {page_num}] ✓ Extracted {len(club_urls)} clubs ({len(new_urls)} new)")
+            self.all_club_urls.extend(new_urls)
+
+        # Pages arrive together, so the CSV is written once
+        self.save_urls_to_csv()
         print(f"\n✅ Total unique clubs scraped: {len(set(self.all_club_urls))}")
         return self.all_club_urls
 
-
-
     def save_urls_to_csv(self, filename=None):
         """Save all club URLs to CSV inside Scrapping/Data/Clubs/"""
-        # Root = project folder
-        root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        data_dir = os.path.join(root_dir, "Data", "Clubs")
-        os.makedirs(data_dir, exist_ok=True)
-        filename = os.path.join(data_dir, "club_urls.csv")
+        filename = filename or self.output_file
 
         unique_urls = list(dict.fromkeys(self.all_club_urls))
         with open(filename, "w", newline="", encoding="utf-8") as f:
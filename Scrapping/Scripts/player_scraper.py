@@ -2,9 +2,443 @@
 Modular SoFIFA Player Scraper
 Extracts comprehensive player data from sofifa.com
 """
+import asyncio
+import gzip
+import hashlib
+import os
 import re
+import time
+from functools import lru_cache
+from urllib.parse import urlsplit
+import httpx
 from playwright.async_api import Page
 
+_PLAYER_ID_RE = re.compile(r'/player/(\d+)/')
+_VERSION_RE = re.compile(r'/(\d+)/?$')
+
+# Cached player pages older than this are fetched again
+CACHE_TTL = 7 * 24 * 3600
+
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Browser-like request headers, shared by the HTTP clients and browser contexts
+EXTRA_HEADERS = {
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none'
+}
+
+CLOUDFLARE_MARKERS = ('Checking your browser', 'Just a moment', 'cf-browser-verification')
+
+# Navigation status Cloudflare answers a challenge with
+CLOUDFLARE_STATUSES = frozenset({403})
+
+# Statuses that only mean "slow down"; the clearance cookie is still good
+RATE_LIMIT_STATUSES = frozenset({429, 503})
+
+# Subresources the extractor never needs
+BLOCKED_RESOURCE_TYPES = frozenset({'image', 'stylesheet', 'font', 'media'})
+
+# Analytics/ads hosts, blocked together with any of their subdomains
+BLOCKED_DOMAINS = (
+    'google-analytics.com', 'googletagmanager.com', 'googlesyndication.com',
+    'doubleclick.net', 'adservice.google.com', 'facebook.com', 'facebook.net',
+    'cdn.segment.com', 'scorecardresearch.com', 'quantserve.com',
+    'amazon-adsystem.com', 'hotjar.com'
+)
+
+
+@lru_cache(maxsize=1024)
+def _is_blocked_host(host: str) -> bool:
+    return any(host == domain or host.endswith('.' + domain) for domain in BLOCKED_DOMAINS)
+
+
+def is_cloudflare_response(response) -> bool:
+    """Tell a challenge/block from the navigation response alone, without reading the page"""
+    if response is None:
+        return False
+    return response.status in CLOUDFLARE_STATUSES or 'cf-mitigated' in response.headers
+
+
+def is_rate_limited_response(response) -> bool:
+    """429/503 without a challenge: too many requests, not a failed clearance"""
+    return response is not None and response.status in RATE_LIMIT_STATUSES
+
+
+async def _block_unneeded(route):
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or _is_blocked_host(urlsplit(request.url).hostname or ''):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+def new_http_client() -> httpx.AsyncClient:
+    """Pooled HTTP/2 client for fetching sofifa pages without a browser"""
+    return httpx.AsyncClient(
+        http2=True,
+        headers={'User-Agent': USER_AGENT, **EXTRA_HEADERS},
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+        follow_redirects=True,
+        timeout=15.0
+    )
+
+
+# Player page extractor, installed once per context with add_init_script so each
+# page only needs a tiny evaluate() call to run it
+EXTRACTOR_JS = """
+window.__extractPlayer = () => {
+    const data = {};
+
+    // Regexes are built once per evaluate, not per call
+    const RE_DIGIT = /\\d+/;
+    const RE_TEAM = /\\/team\\/(\\d+)\\//;
+    const RE_LEAGUE = /\\/league\\/(\\d+)/;
+    const RE_SPACES = /\\s+/g;
+    const RE_NON_SLUG = /[^a-z0-9_]/g;
+    const RE_ROLE_PLUS = /\\s*\\+\\+?\\s*$/;
+
+    // Helper function to clean text
+    const cleanText = (text) => text ? text.trim() : '';
+
+    // Helper to extract number from text (first run of digits)
+    const extractNumber = (text) => {
+        if (!text) return '';
+        let i = 0;
+        while (i < text.length && (text.charCodeAt(i) < 48 || text.charCodeAt(i) > 57)) i++;
+        let j = i;
+        while (j < text.length && text.charCodeAt(j) >= 48 && text.charCodeAt(j) <= 57) j++;
+        return text.slice(i, j);
+    };
+
+    // Helper to parse value/wage (e.g., "€22M" -> "22000000")
+    // Single scan: digits, one decimal point and an M/K suffix
+    const parseValue = (text) => {
+        if (!text) return '';
+        let n = 0, scale = 1, mul = 1, digits = false, dot = false;
+        for (let i = 0; i < text.length; i++) {
+            const c = text.charCodeAt(i);
+            if (c >= 48 && c <= 57) {
+                if (mul !== 1) break;
+                n = n * 10 + (c - 48);
+                if (dot) scale *= 10;
+                digits = true;
+            } else if (c === 46 && !dot) {
+                dot = true;
+            } else if (c === 77) {
+                mul = 1000000;
+            } else if (c === 75 && mul === 1) {
+                mul = 1000;
+            }
+        }
+        return digits ? String(n * mul / scale) : '';
+    };
+
+    // Label dispatch tables: label text -> [field, parser]. Exact labels are a
+    // single Map lookup; anything else falls back to substring matching in table order
+    const asText = (text) => text;
+    const GRID_LABELS = new Map([
+        ['overall', ['overall_rating', extractNumber]],
+        ['potential', ['potential', extractNumber]],
+        ['value', ['value', parseValue]],
+        ['wage', ['wage', parseValue]]
+    ]);
+    const PROFILE_LABELS = new Map([
+        ['preferred foot', ['preferred_foot', asText]],
+        ['weak foot', ['weak_foot', extractNumber]],
+        ['skill moves', ['skill_moves', extractNumber]],
+        ['international reputation', ['international_reputation', extractNumber]],
+        ['body type', ['body_type', asText]],
+        ['real face', ['real_face', asText]],
+        ['release clause', ['release_clause', parseValue]]
+    ]);
+    const COUNTRY_LABELS = new Map([
+        ['position', ['country_position', asText]],
+        ['kit number', ['country_kit_number', asText]]
+    ]);
+    const CLUB_LABELS = new Map([
+        ['position', ['club_position', asText]],
+        ['kit number', ['club_kit_number', asText]],
+        ['joined', ['club_joined', asText]],
+        ['contract', ['club_contract_valid_until', asText]]
+    ]);
+
+    const lookupLabel = (table, labelText) => {
+        const entry = table.get(labelText);
+        if (entry) return entry;
+        for (const [key, fallback] of table) {
+            if (labelText.includes(key)) return fallback;
+        }
+        return null;
+    };
+
+    // Sections can share a column, so each column's <p> list is walked once
+    const colParagraphs = new Map();
+    const paragraphsOf = (col) => {
+        let paragraphs = colParagraphs.get(col);
+        if (!paragraphs) {
+            paragraphs = col.querySelectorAll('p');
+            colParagraphs.set(col, paragraphs);
+        }
+        return paragraphs;
+    };
+
+    // Text of a <p> without its <label>, from the child nodes instead of
+    // serializing the whole paragraph and cutting the label back out
+    const valueOf = (p, labelEl) => {
+        if (labelEl.parentNode !== p) {
+            return cleanText(p.textContent.replace(labelEl.textContent, ''));
+        }
+        let out = '';
+        for (const node of p.childNodes) {
+            if (node !== labelEl) out += node.textContent;
+        }
+        return cleanText(out);
+    };
+
+    // Fill fields from a column's "<p><label>Label</label> value</p>" rows
+    const applyLabels = (col, table) => {
+        paragraphsOf(col).forEach(p => {
+            const labelEl = p.querySelector('label');
+            if (!labelEl) return;
+
+            const entry = lookupLabel(table, cleanText(labelEl.textContent).toLowerCase());
+            if (!entry) return;
+
+            data[entry[0]] = entry[1](valueOf(p, labelEl));
+        });
+    };
+
+    // Description, names, body, version and positions from the page header
+    const extractHeader = () => {
+        const metaDesc = document.querySelector('meta[name="description"]');
+        data.description = metaDesc ? metaDesc.content : '';
+
+        if (schema) {
+            data.full_name = `${schema.givenName || ''} ${schema.familyName || ''}`.trim();
+            data.dob = schema.birthDate || '';
+            data.image = schema.image || '';
+
+            // Parse height and weight
+            if (schema.height) {
+                const heightMatch = schema.height.match(RE_DIGIT);
+                data.height_cm = heightMatch ? heightMatch[0] : '';
+            }
+            if (schema.weight) {
+                const weightMatch = schema.weight.match(RE_DIGIT);
+                data.weight_kg = weightMatch ? weightMatch[0] : '';
+            }
+        }
+
+        // Get player short name from header
+        const nameElement = document.querySelector('h1.ellipsis');
+        data.name = nameElement ? cleanText(nameElement.textContent) : '';
+
+        // Get full name from profile if not from schema
+        if (!data.full_name) {
+            const fullNameElement = document.querySelector('.profile h1');
+            if (fullNameElement) {
+                data.full_name = cleanText(fullNameElement.textContent);
+            }
+        }
+
+        // Extract version from select
+        const versionSelect = document.querySelector('#select-version option[selected]');
+        data.version = versionSelect ? cleanText(versionSelect.textContent) : '';
+
+        // Extract positions from profile
+        const posSpans = document.querySelectorAll('.profile .pos');
+        data.positions = Array.from(posSpans).map(span => cleanText(span.textContent)).join(', ');
+    };
+
+    // Overall rating, potential, value and wage
+    const extractOverview = () => {
+        document.querySelectorAll('.grid .col').forEach(col => {
+            const sub = col.querySelector('.sub');
+            const em = col.querySelector('em');
+            if (sub && em) {
+                const entry = lookupLabel(GRID_LABELS, cleanText(sub.textContent).toLowerCase());
+                if (entry) {
+                    data[entry[0]] = entry[1](cleanText(em.textContent));
+                }
+            }
+        });
+    };
+
+    // Individual stats use category_attribute naming (e.g. attacking_crossing)
+    const extractStats = (col, section) => {
+        paragraphsOf(col).forEach(p => {
+            const em = p.querySelector('em');
+            const span = p.querySelector('span[data-tippy-right-start]');
+            if (!em || !span) return;
+
+            // Normalize stat name to snake_case
+            let normalizedName = cleanText(span.textContent).toLowerCase()
+                .replace(RE_SPACES, '_')
+                .replace(RE_NON_SLUG, '');
+
+            // Rename "att_position" to "att_positioning" for mentality
+            if (normalizedName === 'att_position') {
+                normalizedName = 'att_positioning';
+            }
+
+            data[`${section}_${normalizedName}`] = extractNumber(cleanText(em.textContent));
+        });
+    };
+
+    // Team and league links plus star rating, shared by club and national team
+    const extractTeam = (col, prefix) => {
+        const teamLink = col.querySelector('a[href*="/team/"]');
+        if (teamLink) {
+            data[`${prefix}_name`] = cleanText(teamLink.textContent);
+            const teamHref = teamLink.getAttribute('href');
+            const teamIdMatch = teamHref ? teamHref.match(RE_TEAM) : null;
+            data[`${prefix}_id`] = teamIdMatch ? teamIdMatch[1] : '';
+        }
+
+        const leagueLink = col.querySelector('a[href*="/league/"]');
+        if (leagueLink) {
+            data[`${prefix}_league_name`] = cleanText(leagueLink.textContent);
+            const leagueHref = leagueLink.getAttribute('href');
+            const leagueIdMatch = leagueHref ? leagueHref.match(RE_LEAGUE) : null;
+            data[`${prefix}_league_id`] = leagueIdMatch ? leagueIdMatch[1] : '';
+        }
+
+        data[`${prefix}_rating`] = col.querySelectorAll('svg.star').length.toString();
+        return teamLink;
+    };
+
+    const extractProfile = (col) => applyLabels(col, PROFILE_LABELS);
+
+    const extractSpecialities = (col) => {
+        const specialities = Array.from(col.querySelectorAll('a')).map(a => cleanText(a.textContent));
+        data.specialities = specialities.join(', ');
+    };
+
+    const extractNationalTeam = (col) => {
+        extractTeam(col, 'country');
+
+        const flagImg = col.querySelector('img.flag');
+        if (flagImg) {
+            const flagSrc = flagImg.getAttribute('data-src') || flagImg.getAttribute('src');
+            data.country_flag = flagSrc || '';
+        }
+
+        // Position and kit number
+        applyLabels(col, COUNTRY_LABELS);
+    };
+
+    const extractClub = (col) => {
+        const teamLink = extractTeam(col, 'club');
+        const logoImg = teamLink ? teamLink.querySelector('img.avatar') : null;
+        if (logoImg) {
+            const logoSrc = logoImg.getAttribute('data-src') || logoImg.getAttribute('src');
+            data.club_logo = logoSrc || '';
+        }
+
+        // Position, kit number, joined, contract
+        applyLabels(col, CLUB_LABELS);
+    };
+
+    const extractPlayStyles = (col) => {
+        const playStyleSpans = col.querySelectorAll('span[data-tippy-right-start]');
+        // Remove the role-plus indicators
+        data.play_styles = Array.from(playStyleSpans)
+            .map(span => cleanText(span.textContent).replace(RE_ROLE_PLUS, ''))
+            .join(', ');
+    };
+
+    // Section title -> extractor. Profile-grid sections only count inside
+    // the '.grid.attribute' block, other h5s with the same title are skipped
+    const STAT_SECTIONS = ['attacking', 'skill', 'movement', 'power', 'mentality', 'defending', 'goalkeeping'];
+    const SECTION_EXTRACTORS = new Map([
+        ['profile', [extractProfile, true]],
+        ['player specialities', [extractSpecialities, true]],
+        ['national team', [extractNationalTeam, true]],
+        ['club', [extractClub, true]],
+        ['playstyles', [extractPlayStyles, false]],
+        ...STAT_SECTIONS.map(section => [section, [col => extractStats(col, section), false]])
+    ]);
+
+    // JSON-LD schema, parsed once for the header and the nationality fallback
+    let schema = null;
+    const jsonLd = document.querySelector('script[type="application/ld+json"]');
+    if (jsonLd) {
+        try {
+            schema = JSON.parse(jsonLd.textContent);
+        } catch (e) {}
+    }
+
+    extractHeader();
+    extractOverview();
+
+    // Map every known section title (h5) to its column in a single pass,
+    // then extract each section from its column. First eligible match wins.
+    const sections = new Map();
+    document.querySelectorAll('h5').forEach(h5 => {
+        const name = cleanText(h5.textContent).toLowerCase();
+        const extractor = SECTION_EXTRACTORS.get(name);
+        if (!extractor || sections.has(name)) return;
+
+        // Titles normally sit directly in their column; only walk up the tree when not
+        const parent = h5.parentElement;
+        const col = parent && parent.matches('div[class*="col"]')
+            ? parent
+            : (h5.closest('div[class*="col"]') || parent);
+
+        // A same-titled h5 outside the profile grid must not take the grid's slot
+        const [extract, profileColOnly] = extractor;
+        if (!col || (profileColOnly && !col.matches('.grid.attribute > .col'))) return;
+        sections.set(name, [extract, col]);
+    });
+
+    sections.forEach(([extract, col]) => extract(col));
+
+    if (!data.country_name && schema && schema.nationality) {
+        data.country_name = schema.nationality;
+    }
+    return data;
+};
+"""
+
+# Defines and runs the extractor in one call, for pages without the init script
+_EXTRACT_FALLBACK_JS = "() => {" + EXTRACTOR_JS + "return window.__extractPlayer(); }"
+
+
+class PlayerPageCache:
+    """Gzipped on-disk cache of player page HTML, keyed by URL"""
+    
+    def __init__(self, cache_dir: str, ttl: float = CACHE_TTL):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+    
+    def path(self, url: str) -> str:
+        """cache_dir/ab/abcdef....html.gz, from the sha1 of the URL"""
+        digest = hashlib.sha1(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], digest + '.html.gz')
+    
+    def get(self, url: str):
+        """Return the cached HTML for url, or None if missing or expired"""
+        path = self.path(url)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return None
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                return f.read()
+        except (OSError, EOFError):
+            return None
+    
+    def put(self, url: str, html: str):
+        """Store html for url (written to a temp file, then renamed)"""
+        path = self.path(url)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            f.write(html)
+        os.replace(tmp_path, path)
+
 
 class PlayerScraper:
     """Handles extraction of player data from a single player page"""
@@ -12,323 +446,89 @@ class PlayerScraper:
     @staticmethod
     def extract_player_id(url: str) -> str:
         """Extract player ID from URL"""
-        match = re.search(r'/player/(\d+)/', url)
+        match = _PLAYER_ID_RE.search(url)
         return match.group(1) if match else ''
     
     @staticmethod
     def extract_version(url: str) -> str:
         """Extract version/roster from URL"""
-        match = re.search(r'/(\d+)/?$', url)
+        match = _VERSION_RE.search(url)
         return match.group(1) if match else ''
     
     @staticmethod
-    async def scrape_player_data(page: Page, url: str) -> dict:
+    async def block_resources(context):
+        """Abort images, CSS, fonts, media and tracker requests for every page of context"""
+        await context.route("**/*", _block_unneeded)
+    
+    @staticmethod
+    async def install_extractor(context):
+        """Define the player extractor in every page of context before its scripts run"""
+        await context.add_init_script(EXTRACTOR_JS)
+    
+    @staticmethod
+    async def fetch_page(client: httpx.AsyncClient, url: str):
+        """
+        Fetch a player page over plain HTTP
+        Returns the HTML, or None if blocked by Cloudflare or the request failed
+        """
+        try:
+            response = await client.get(url)
+            response.raise_for_status()
+        except httpx.HTTPError:
+            return None
+        
+        html = response.text
+        if any(marker in html for marker in CLOUDFLARE_MARKERS):
+            return None
+        return html
+    
+    @staticmethod
+    async def load_page(page: Page, url: str, cache: PlayerPageCache = None,
+                        client: httpx.AsyncClient = None) -> tuple[str, str]:
+        """
+        Load a player page into page: from cache, then plain HTTP, then the browser
+        Returns (source, html). source is where the HTML came from: 'cache',
+        'http' or 'browser', 'cloudflare' if the browser navigation was
+        challenged, or 'rate_limited' if it was only answered with 429/503.
+        html is the page source when it was already in hand (cache/HTTP), else None
+        """
+        # gunzip in a thread, off the event loop
+        html = await asyncio.to_thread(cache.get, url) if cache else None
+        if html is not None:
+            await page.set_content(html, wait_until="domcontentloaded")
+            return 'cache', html
+        
+        html = await PlayerScraper.fetch_page(client, url) if client else None
+        if html is not None:
+            await page.set_content(html, wait_until="domcontentloaded")
+            return 'http', html
+        
+        response = await page.goto(url, wait_until="domcontentloaded", timeout=15000)
+        if is_cloudflare_response(response):
+            return 'cloudflare', None
+        if is_rate_limited_response(response):
+            return 'rate_limited', None
+        return 'browser', None
+    
+    @staticmethod
+    async def scrape_player_data(page: Page, url: str) -> tuple[bool, dict]:
         """
         Scrape all player data from a player page
-        Returns a dictionary with all player attributes
+        Returns (True, stats) with all player attributes, or (False, {}) when
+        the page has no player name (challenge, empty or broken page)
         """
-        # Extract player stats using JavaScript
-        stats = await page.evaluate("""
-            () => {
-                const data = {};
-                
-                // Helper function to clean text
-                const cleanText = (text) => text ? text.trim() : '';
-                
-                // Helper to extract number from text
-                const extractNumber = (text) => {
-                    if (!text) return '';
-                    const match = text.match(/\\d+/);
-                    return match ? match[0] : '';
-                };
-                
-                // Helper to parse value/wage (e.g., "€22M" -> "22000000")
-                const parseValue = (text) => {
-                    if (!text) return '';
-                    text = text.replace(/[€$£,]/g, '');
-                    if (text.includes('M')) {
-                        return (parseFloat(text) * 1000000).toString();
-                    } else if (text.includes('K')) {
-                        return (parseFloat(text) * 1000).toString();
-                    }
-                    return text;
-                };
-                
-                // Extract from meta description
-                const metaDesc = document.querySelector('meta[name="description"]');
-                data.description = metaDesc ? metaDesc.content : '';
-                
-                // Extract from JSON-LD schema
-                const jsonLd = document.querySelector('script[type="application/ld+json"]');
-                if (jsonLd) {
-                    try {
-                        const schema = JSON.parse(jsonLd.textContent);
-                        data.full_name = `${schema.givenName || ''} ${schema.familyName || ''}`.trim();
-                        data.dob = schema.birthDate || '';
-                        data.image = schema.image || '';
-                        
-                        // Parse height and weight
-                        if (schema.height) {
-                            const heightMatch = schema.height.match(/\\d+/);
-                            data.height_cm = heightMatch ? heightMatch[0] : '';
-                        }
-                        if (schema.weight) {
-                            const weightMatch = schema.weight.match(/\\d+/);
-                            data.weight_kg = weightMatch ? weightMatch[0] : '';
-                        }
-                    } catch (e) {}
-                }
-                
-                // Get player short name from header
-                const nameElement = document.querySelector('h1.ellipsis');
-                data.name = nameElement ? cleanText(nameElement.textContent) : '';
-                
-                // Get full name from profile if not from schema
-                if (!data.full_name) {
-                    const fullNameElement = document.querySelector('.profile h1');
-                    if (fullNameElement) {
-                        data.full_name = cleanText(fullNameElement.textContent);
-                    }
-                }
-                
-                // Extract version from select
-                const versionSelect = document.querySelector('#select-version option[selected]');
-                data.version = versionSelect ? cleanText(versionSelect.textContent) : '';
-                
-                // Extract positions from profile
-                const posSpans = document.querySelectorAll('.profile .pos');
-                data.positions = Array.from(posSpans).map(span => cleanText(span.textContent)).join(', ');
-                
-                // Extract overall rating, potential, value, wage
-                const gridCols = document.querySelectorAll('.grid .col');
-                gridCols.forEach(col => {
-                    const sub = col.querySelector('.sub');
-                    const em = col.querySelector('em');
-                    if (sub && em) {
-                        const label = cleanText(sub.textContent).toLowerCase();
-                        const value = cleanText(em.textContent);
-                        
-                        if (label.includes('overall')) {
-                            data.overall_rating = extractNumber(value);
-                        } else if (label.includes('potential')) {
-                            data.potential = extractNumber(value);
-                        } else if (label.includes('value')) {
-                            data.value = parseValue(value);
-                        } else if (label.includes('wage')) {
-                            data.wage = parseValue(value);
-                        }
-                    }
-                });
-                
-                // Extract profile attributes
-                const profileCols = document.querySelectorAll('.grid.attribute > .col');
-                profileCols.forEach(col => {
-                    const h5 = col.querySelector('h5');
-                    if (!h5) return;
-                    
-                    const section = cleanText(h5.textContent).toLowerCase();
-                    
-                    if (section === 'profile') {
-                        const labels = col.querySelectorAll('p');
-                        labels.forEach(p => {
-                            const labelEl = p.querySelector('label');
-                            if (!labelEl) return;
-                            
-                            const labelText = cleanText(labelEl.textContent).toLowerCase();
-                            const valueText = cleanText(p.textContent.replace(labelEl.textContent, ''));
-                            
-                            if (labelText.includes('preferred foot')) {
-                                data.preferred_foot = valueText;
-                            } else if (labelText.includes('weak foot')) {
-                                data.weak_foot = extractNumber(valueText);
-                            } else if (labelText.includes('skill moves')) {
-                                data.skill_moves = extractNumber(valueText);
-                            } else if (labelText.includes('international reputation')) {
-                                data.international_reputation = extractNumber(valueText);
-                            } else if (labelText.includes('body type')) {
-                                data.body_type = valueText;
-                            } else if (labelText.includes('real face')) {
-                                data.real_face = valueText;
-                            } else if (labelText.includes('release clause')) {
-                                data.release_clause = parseValue(valueText);
-                            }
-                        });
-                    } else if (section === 'player specialities') {
-                        const specialities = Array.from(col.querySelectorAll('a')).map(a => cleanText(a.textContent));
-                        data.specialities = specialities.join(', ');
-                    } else if (section === 'national team') {
-                        const teamLink = col.querySelector('a[href*="/team/"]');
-                        if (teamLink) {
-                            data.country_name = cleanText(teamLink.textContent);
-                            const teamHref = teamLink.getAttribute('href');
-                            const teamIdMatch = teamHref ? teamHref.match(/\\/team\\/(\\d+)\\//) : null;
-                            data.country_id = teamIdMatch ? teamIdMatch[1] : '';
-                        }
-                        
-                        const leagueLink = col.querySelector('a[href*="/league/"]');
-                        if (leagueLink) {
-                            data.country_league_name = cleanText(leagueLink.textContent);
-                            const leagueHref = leagueLink.getAttribute('href');
-                            const leagueIdMatch = leagueHref ? leagueHref.match(/\\/league\\/(\\d+)/) : null;
-                            data.country_league_id = leagueIdMatch ? leagueIdMatch[1] : '';
-                        }
-                        
-                        const flagImg = col.querySelector('img.flag');
-                        if (flagImg) {
-                            const flagSrc = flagImg.getAttribute('data-src') || flagImg.getAttribute('src');
-                            data.country_flag = flagSrc || '';
-                        }
-                        
-                        // Extract country rating (stars)
-                        const stars = col.querySelectorAll('svg.star');
-                        data.country_rating = stars.length.toString();
-                        
-                        // Extract position and kit number
-                        const posLabels = col.querySelectorAll('p');
-                        posLabels.forEach(p => {
-                            const labelEl = p.querySelector('label');
-                            if (!labelEl) return;
-                            
-                            const labelText = cleanText(labelEl.textContent).toLowerCase();
-                            const valueText = cleanText(p.textContent.replace(labelEl.textContent, ''));
-                            
-                            if (labelText.includes('position')) {
-                                data.country_position = valueText;
-                            } else if (labelText.includes('kit number')) {
-                                data.country_kit_number = valueText;
-                            }
-                        });
-                    } else if (section === 'club') {
-                        const teamLink = col.querySelector('a[href*="/team/"]');
-                        if (teamLink) {
-                            data.club_name = cleanText(teamLink.textContent);
-                            const teamHref = teamLink.getAttribute('href');
-                            const teamIdMatch = teamHref ? teamHref.match(/\\/team\\/(\\d+)\\//) : null;
-                            data.club_id = teamIdMatch ? teamIdMatch[1] : '';
-                            
-                            const logoImg = teamLink.querySelector('img.avatar');
-                            if (logoImg) {
-                                const logoSrc = logoImg.getAttribute('data-src') || logoImg.getAttribute('src');
-                                data.club_logo = logoSrc || '';
-                            }
-                        }
-                        
-                        const leagueLink = col.querySelector('a[href*="/league/"]');
-                        if (leagueLink) {
-                            data.club_league_name = cleanText(leagueLink.textContent);
-                            const leagueHref = leagueLink.getAttribute('href');
-                            const leagueIdMatch = leagueHref ? leagueHref.match(/\\/league\\/(\\d+)/) : null;
-                            data.club_league_id = leagueIdMatch ? leagueIdMatch[1] : '';
-                        }
-                        
-                        // Extract club rating (stars)
-                        const stars = col.querySelectorAll('svg.star');
-                        data.club_rating = stars.length.toString();
-                        
-                        // Extract position, kit number, joined, contract
-                        const clubLabels = col.querySelectorAll('p');
-                        clubLabels.forEach(p => {
-                            const labelEl = p.querySelector('label');
-                            if (!labelEl) return;
-                            
-                            const labelText = cleanText(labelEl.textContent).toLowerCase();
-                            const valueText = cleanText(p.textContent.replace(labelEl.textContent, ''));
-                            
-                            if (labelText.includes('position')) {
-                                data.club_position = valueText;
-                            } else if (labelText.includes('kit number')) {
-                                data.club_kit_number = valueText;
-                            } else if (labelText.includes('joined')) {
-                                data.club_joined = valueText;
-                            } else if (labelText.includes('contract')) {
-                                data.club_contract_valid_until = valueText;
-                            }
-                        });
-                    }
-                });
-                
-                // Extract individual stats with category_attribute naming
-                const statSections = ['attacking', 'skill', 'movement', 'power', 'mentality', 'defending', 'goalkeeping'];
-                
-                statSections.forEach(sectionName => {
-                    const h5Elements = Array.from(document.querySelectorAll('h5'));
-                    const sectionH5 = h5Elements.find(h5 => h5.textContent.trim().toLowerCase() === sectionName);
-                    
-                    if (sectionH5) {
-                        const container = sectionH5.closest('div[class*="col"]') || sectionH5.parentElement;
-                        
-                        if (container) {
-                            const statParagraphs = container.querySelectorAll('p');
-                            
-                            statParagraphs.forEach(p => {
-                                const em = p.querySelector('em');
-                                const span = p.querySelector('span[data-tippy-right-start]');
-                                
-                                if (em && span) {
-                                    const statValue = cleanText(em.textContent);
-                                    const statName = cleanText(span.textContent);
-                                    
-                                    // Normalize stat name to snake_case
-                                    let normalizedName = statName.toLowerCase()
-                                        .replace(/\\s+/g, '_')
-                                        .replace(/[^a-z0-9_]/g, '');
-                                    
-                                    // Rename "att_position" to "att_positioning" for mentality
-                                    if (normalizedName === 'att_position') {
-                                        normalizedName = 'att_positioning';
-                                    }
-                                    
-                                    // Prefix with category name (e.g., attacking_crossing, skill_dribbling)
-                                    const fullStatName = `${sectionName}_${normalizedName}`;
-                                    
-                                    data[fullStatName] = extractNumber(statValue);
-                                }
-                            });
-                        }
-                    }
-                });
-                
-                // Extract PlayStyles
-                const playStylesH5 = Array.from(document.querySelectorAll('h5')).find(h5 => 
-                    h5.textContent.trim().toLowerCase() === 'playstyles'
-                );
-                
-                if (playStylesH5) {
-                    const container = playStylesH5.closest('div[class*="col"]') || playStylesH5.parentElement;
-                    if (container) {
-                        const playStyleSpans = container.querySelectorAll('span[data-tippy-right-start]');
-                        const playStyles = Array.from(playStyleSpans).map(span => {
-                            // Remove the role-plus indicators
-                            let text = cleanText(span.textContent);
-                            text = text.replace(/\\s*\\+\\+?\\s*$/, '');
-                            return text;
-                        });
-                        data.play_styles = playStyles.join(', ');
-                    }
-                }
-                if (!data.country_name) {
-                    const jsonLd = document.querySelector('script[type="application/ld+json"]');
-                    if (jsonLd) {
-                        try {
-                            const schema = JSON.parse(jsonLd.textContent);
-                            if (schema.nationality) {
-                                data.country_name = schema.nationality;
-                            }
-                        } catch (e) {}
-                    }   
-                }
-                return data;
-            }
-        """)
+        # Run the installed extractor; pages loaded with set_content (cache/HTTP)
+        # or a context without the init script fall back to sending it along
+        stats = await page.evaluate("() => window.__extractPlayer ? window.__extractPlayer() : null")
+        if stats is None:
+            stats = await page.evaluate(_EXTRACT_FALLBACK_JS)
+        
+        if not stats.get('name'):
+            return False, {}
         
-        # Add player_id and URL
+        # Keys come back already in lowercase snake_case (stat names are
+        # normalized in the extractor), so no Python-side pass is needed
         stats['player_id'] = PlayerScraper.extract_player_id(url)
         stats['url'] = url
         
-        # Normalize all keys to lowercase snake_case
-        normalized_stats = {}
-        for key, value in stats.items():
-            normalized_key = key.lower().replace(' ', '_').replace('-', '_')
-            normalized_stats[normalized_key] = value
-        
-        return normalized_stats
+        return True, stats
@@ -3,166 +3,251 @@ SoFIFA Player URL Scraper
 Scrapes all player URLs from sofifa.com paginated list
 """
 import csv
+import random
 import asyncio
+from collections import deque
+from pathlib import Path
+from urllib.parse import urljoin
+import httpx
+from selectolax.parser import HTMLParser
 from playwright.async_api import async_playwright
-import os
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from player_scraper import CLOUDFLARE_MARKERS, EXTRA_HEADERS, USER_AGENT, PlayerScraper, new_http_client
+
+
+# Scrapping/data/, resolved once at import
+_DATA_DIR = Path(__file__).resolve().parents[2] / "Scrapping" / "data"
+_URLS_CSV = _DATA_DIR / "player_urls.csv"
+
+
+class CloudflareChallenge(Exception):
+    """Raised when a plain HTTP fetch gets a Cloudflare challenge instead of the page"""
 
 
 class PlayerURLScraper:
-    def __init__(self, base_url="https://sofifa.com/players?col=oa&sort=desc"):
+    def __init__(self, base_url="https://sofifa.com/players?col=oa&sort=desc", max_concurrency=5):
         self.base_url = base_url
+        # Unique URLs in scrape order; ``seen`` keeps the dedup O(1) per URL
         self.all_player_urls = []
+        self.seen = set()
         self.offset = 0
         self.page_size = 60
+        # Number of list pages fetched in parallel
+        self.max_concurrency = max_concurrency
 
-    async def scrape_all_player_urls(self):
-        """Scrape all player URLs from paginated list"""
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(
-                headless=True,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox'
-                ]
-            )
-            
+        # Playwright is only started if a page needs the browser fallback
+        self._playwright = None
+        self._browser = None
+        self._pool = None
+        self._pool_lock = asyncio.Lock()
+
+        # CSV path and number of URLs already written there (rows are appended)
+        self._saved_path = None
+        self._saved_count = 0
+
+    async def _launch_browser(self, p):
+        """Launch the single Chromium instance shared by all pooled contexts"""
+        return await p.chromium.launch(
+            headless=True,
+            args=[
+                '--disable-blink-features=AutomationControlled',
+                '--disable-dev-shm-usage',
+                '--no-sandbox',
+                '--disable-setuid-sandbox'
+            ]
+        )
+
+    async def _open_page_pool(self, browser, size):
+        """Create `size` pages, each in its own context, queued for reuse"""
+        pool = asyncio.Queue()
+        for _ in range(size):
             context = await browser.new_context(
-                user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                user_agent=USER_AGENT,
                 viewport={'width': 1920, 'height': 1080},
                 locale='en-US',
                 timezone_id='America/New_York',
-                extra_http_headers={
-                    'Accept-Language': 'en-US,en;q=0.9',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                    'Sec-Fetch-Dest': 'document',
-                    'Sec-Fetch-Mode': 'navigate',
-                    'Sec-Fetch-Site': 'none'
-                }
+                extra_http_headers=EXTRA_HEADERS
             )
-            
-            page = await context.new_page()
-            
-            # Block images, stylesheets, fonts to optimize loading
-            await page.route("**/*", lambda route: route.abort() if route.request.resource_type in ["image", "stylesheet", "font", "media"] else route.continue_())
-            
-            page_num = 1
-            has_next = True
-            
-            while has_next:
-                url = f"{self.base_url}&offset={self.offset}" if self.offset > 0 else self.base_url
-                
-                retries = 0
-                max_retries = 3
-                success = False
-                
-                while retries < max_retries and not success:
+            # Block images, stylesheets, fonts and trackers once for the whole context
+            await PlayerScraper.block_resources(context)
+
+            pool.put_nowait(await context.new_page())
+        return pool
+
+    async def _scrape_list_page(self, pool, url):
+        """Scrape one list page on a pooled page; returns {urls, hasNext} or None on failure"""
+        page = await pool.get()
+        try:
+            retries = 0
+            max_retries = 3
+
+            while retries < max_retries:
+                try:
+                    if retries > 0:
+                        # Exponential backoff with jitter so parallel pages don't retry in lockstep
+                        backoff = min(2 ** retries + random.random(), 30)
+                        print(f"  Retry {retries}/{max_retries} for {url} after {backoff:.1f}s pause...")
+                        await asyncio.sleep(backoff)
+
+                    await page.goto(url, wait_until="domcontentloaded", timeout=15000)
                     try:
-                        if retries > 0:
-                            print(f"  Retry {retries}/{max_retries} after 10s pause...")
-                            await asyncio.sleep(10)
-                        
-                        print(f"\n[Page {page_num}] Scraping: {url}")
-                        
-                        await page.goto(url, wait_until="domcontentloaded", timeout=15000)
-                        await page.wait_for_timeout(2000)
-                        
-                        # Check for Cloudflare challenge
-                        page_content = await page.content()
-                        if 'Checking your browser' in page_content or 'Just a moment' in page_content or 'cf-browser-verification' in page_content:
-                            print("  ⚠ Cloudflare challenge detected")
-                            retries += 1
-                            continue
-                        
-                        # Extract player URLs from current page
-                        page_data = await page.evaluate("""
-                            () => {
-                                const urls = [];
-                                const links = document.querySelectorAll('a[href*="/player/"]');
-                                
-                                links.forEach(link => {
-                                    const href = link.href;
-                                    // Only get unique player profile URLs (not random links)
-                                    if (href && href.includes('/player/') && !href.includes('random') && !urls.includes(href)) {
-                                        urls.push(href);
-                                    }
-                                });
-                                
-                                // Check if "Next" button exists
-                                const nextButton = [...document.querySelectorAll('a.button')].find(a => a.textContent.includes('Next'));
-                                const hasNext = Boolean(nextButton);
-                                
-                                return { urls, hasNext };
-                            }
-                        """)
-                        
-                        player_urls = page_data['urls']
-                        has_next = page_data['hasNext']
-                        
-                        print(f"  ✓ Extracted {len(player_urls)} player URLs")
-                        print(f"  Next button exists: {has_next}")
-                        
-                        # Add to collection
-                        self.all_player_urls.extend(player_urls)
-                        
-                        # Save after each page
-                        self.save_urls_to_csv()
-                        
-                        success = True
-                        
-                        # Move to next page
-                        if has_next:
-                            self.offset += self.page_size
-                            page_num += 1
-                        
-                    except Exception as e:
-                        print(f"  ✗ Error: {str(e)}")
+                        await page.wait_for_selector('a[href*="/player/"]', timeout=5000)
+                    except PlaywrightTimeoutError:
+                        pass  # Cloudflare page or empty list, checked below
+
+                    # Check for Cloudflare challenge
+                    page_content = await page.content()
+                    if any(marker in page_content for marker in CLOUDFLARE_MARKERS):
+                        print(f"  ⚠ Cloudflare challenge detected on {url}")
                         retries += 1
-                        if retries >= max_retries:
-                            print(f"  ✗ Failed after {max_retries} retries")
-                            has_next = False  # Stop pagination on failure
-            
-            await browser.close()
-            
-        return self.all_player_urls
+                        continue
 
-    def save_urls_to_csv(self, filename="player_urls.csv"):
-        """Save all player URLs to CSV file in the 'Data-driven-Analysis-of-Football-Player-Performance/Scrapping/data' directory"""
-    
-        # Get the absolute path of the current script (e.g. Scrapping/Scripts/)
-        current_dir = os.path.dirname(os.path.abspath(__file__))
+                    # Parse the HTML we already have instead of a second evaluate
+                    return self.parse_list_page(page_content, page.url)
 
-        # Go two levels up to reach the project root
-        project_root = os.path.abspath(os.path.join(current_dir, "..", ".."))
+                except Exception as e:
+                    print(f"  ✗ Error on {url}: {str(e)}")
+                    retries += 1
 
-        # Build the target data directory path
-        data_dir = os.path.join(
-            project_root,
-            "Scrapping",
-            "data"
-        )
+            print(f"  ✗ Failed {url} after {max_retries} retries")
+            return None
+        finally:
+            pool.put_nowait(page)
 
-        # Ensure the directory exists
-        os.makedirs(data_dir, exist_ok=True)
+    async def _get_pool(self):
+        """Start the browser and page pool on first use"""
+        async with self._pool_lock:
+            if self._pool is None:
+                print("  Starting browser for Cloudflare fallback...")
+                self._playwright = await async_playwright().start()
+                self._browser = await self._launch_browser(self._playwright)
+                self._pool = await self._open_page_pool(self._browser, self.max_concurrency)
+        return self._pool
 
-        # Full file path
-        filepath = os.path.join(data_dir, filename)
-        # Remove duplicates while preserving order
-        unique_urls = []
+    async def _close_browser(self):
+        if self._browser is not None:
+            await self._browser.close()
+            await self._playwright.stop()
+        self._playwright = self._browser = self._pool = None
+
+    @staticmethod
+    def parse_list_page(html, base_url):
+        """Extract unique player URLs and the presence of a "Next" button"""
+        tree = HTMLParser(html)
+        urls = []
         seen = set()
-        for url in self.all_player_urls:
-            if url not in seen:
-                seen.add(url)
-                unique_urls.append(url)
-        
-        with open(filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['player_url'])
-            for url in unique_urls:
-                writer.writerow([url])
+        for link in tree.css('a[href*="/player/"]'):
+            href = urljoin(base_url, link.attributes.get('href') or '')
+            # Only get unique player profile URLs (not random links)
+            if '/player/' in href and 'random' not in href and href not in seen:
+                seen.add(href)
+                urls.append(href)
+
+        has_next = any('Next' in a.text() for a in tree.css('a.button'))
+        return {'urls': urls, 'hasNext': has_next}
+
+    async def _fetch_list_page_http(self, client, url):
+        """Fetch and parse one list page without a browser"""
+        response = await client.get(url)
+        if response.status_code in (403, 503) or any(marker in response.text for marker in CLOUDFLARE_MARKERS):
+            raise CloudflareChallenge(url)
+        if response.status_code == 404:
+            # Speculative offset past the last page
+            return {'urls': [], 'hasNext': False}
+        response.raise_for_status()
+        return self.parse_list_page(response.text, str(response.url))
+
+    async def _fetch_list_page(self, client, sem, url):
+        """HTTP fast path, falling back to a pooled browser page on Cloudflare or a network error"""
+        async with sem:
+            try:
+                return await self._fetch_list_page_http(client, url)
+            except (CloudflareChallenge, httpx.TransportError) as e:
+                print(f"  ⚠ {type(e).__name__} on {url}, retrying with browser")
+            except httpx.HTTPStatusError as e:
+                # A browser would get the same answer; don't start Chromium for it
+                print(f"  ✗ HTTP {e.response.status_code} on {url}")
+                return None
+        return await self._scrape_list_page(await self._get_pool(), url)
+
+    def _page_url(self, offset):
+        return f"{self.base_url}&offset={offset}" if offset > 0 else self.base_url
+
+    async def scrape_all_player_urls(self):
+        """Scrape all player URLs from paginated list, keeping max_concurrency pages in flight"""
+        sem = asyncio.Semaphore(self.max_concurrency)
+        page_num = 1
+        # (url, task) for pages fetched ahead of the one being consumed, in page order
+        pending = deque()
+
+        try:
+            async with new_http_client() as client:
+                # Offsets are deterministic, so pages are fetched speculatively ahead
+                def schedule(offset):
+                    url = self._page_url(offset)
+                    pending.append((url, asyncio.create_task(self._fetch_list_page(client, sem, url))))
+
+                for i in range(self.max_concurrency):
+                    schedule(self.offset + i * self.page_size)
+
+                # Consume in page order; each consumed page tops the window back up
+                while pending:
+                    url, task = pending.popleft()
+                    page_data = await task
+                    print(f"\n[Page {page_num}] Scraped: {url}")
+                    if page_data is None:
+                        break  # Stop pagination on failure
+
+                    player_urls = page_data['urls']
+                    has_next = page_data['hasNext']
+
+                    new_urls = [u for u in player_urls if u not in self.seen]
+                    print(f"  ✓ Extracted {len(player_urls)} player URLs ({len(new_urls)} new)")
+                    print(f"  Next button exists: {has_next}")
+
+                    # Add to collection
+                    self.seen.update(new_urls)
+                    self.all_player_urls.extend(new_urls)
+
+                    # Save after each page (appends only the new rows)
+                    self.save_urls_to_csv()
+
+                    if not has_next or not player_urls:
+                        break
+
+                    # Move to next page
+                    self.offset += self.page_size
+                    page_num += 1
+                    schedule(self.offset + (self.max_concurrency - 1) * self.page_size)
+        finally:
+            # Pages past the last one are no longer needed
+            for _, task in pending:
+                task.cancel()
+            await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
+            await self._close_browser()
+
+        return self.all_player_urls
+
+    def save_urls_to_csv(self, filename=_URLS_CSV.name):
+        """Save all player URLs to CSV file in the 'Data-driven-Analysis-of-Football-Player-Performance/Scrapping/data' directory"""
+        filepath = _DATA_DIR / filename
+
+        # all_player_urls is already unique; the first save of a run rewrites
+        # the file, later saves only append what was scraped since
+        if filepath != self._saved_path:
+            self._saved_path = filepath
+            self._saved_count = 0
+            _DATA_DIR.mkdir(parents=True, exist_ok=True)
+            with open(filepath, 'w', newline='', encoding='utf-8') as f:
+                csv.writer(f).writerow(['player_url'])
+
+        new_urls = self.all_player_urls[self._saved_count:]
+        if new_urls:
+            with open(filepath, 'a', newline='', encoding='utf-8') as f:
+                csv.writer(f).writerows([url] for url in new_urls)
+            self._saved_count = len(self.all_player_urls)
         
-        print(f"  💾 Saved {len(unique_urls)} unique URLs to {filename}")
+        print(f"  💾 Saved {self._saved_count} unique URLs to {filename}")
 
 
 async def main():
@@ -177,7 +262,9 @@ async def main():
     print("\nFeatures:")
     print("  - Headless mode (no browser window)")
     print("  - Resource blocking for faster loading")
-    print("  - Cloudflare retry with 10s backoff (3 retries)")
+    print("  - Plain HTTP/2 fetches, browser only on Cloudflare challenge")
+    print("  - Rolling window of pages fetched ahead in parallel")
+    print("  - Cloudflare retry with exponential backoff (3 retries)")
     print("  - Saves after each page")
     print("="*60)
     
@@ -190,7 +277,7 @@ async def main():
     print("\n" + "="*60)
     print("SCRAPING COMPLETED!")
     print("="*60)
-    print(f"Total unique player URLs: {len(set(scraper.all_player_urls))}")
+    print(f"Total unique player URLs: {len(scraper.all_player_urls)}")
     print(f"Total pages scraped: {(scraper.offset // scraper.page_size) + 1}")
     print("\nFile created:")
     print("  - player_urls.csv")
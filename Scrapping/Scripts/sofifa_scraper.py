@@ -5,13 +5,197 @@ Comprehensive scraper using modular PlayerScraper
 import argparse
 import os
 import csv
+import io
+import random
 import asyncio
+import itertools
+import json
+import logging
 from playwright.async_api import async_playwright
-from player_scraper import PlayerScraper
+from tqdm import tqdm
+from tqdm.contrib.logging import logging_redirect_tqdm
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+from player_scraper import (CLOUDFLARE_MARKERS, EXTRA_HEADERS, USER_AGENT, PlayerPageCache, PlayerScraper,
+                            new_http_client)
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:  # only needed for --format parquet
+    pa = pc = pq = None
+
+try:
+    import orjson
+except ImportError:  # only needed for --format jsonl
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # only needed for --compress
+    zstandard = None
+
+log = logging.getLogger(__name__)
+
+
+# Parquet column types; anything not listed is stored as a string
+INT64_COLS = {'value', 'wage', 'release_clause'}
+INT32_COLS = {'player_id', 'height_cm', 'weight_kg', 'club_id', 'club_league_id',
+              'country_id', 'country_league_id'}
+INT8_COLS = {'overall_rating', 'potential', 'weak_foot', 'skill_moves',
+             'international_reputation', 'club_rating', 'country_rating'}
+INT8_PREFIXES = ('attacking_', 'skill_', 'movement_', 'power_', 'mentality_',
+                 'defending_', 'goalkeeping_')
+CATEGORY_COLS = {'preferred_foot', 'body_type', 'real_face'}
+
+# Most rows the background writer takes off its queue per write
+CSV_FLUSH_EVERY = 500
+
+# A URL challenged this many times is set aside and retried once after a cooldown
+CF_HITS_BEFORE_DEFER = 2
+DEFER_COOLDOWN = 300
+
+# CSV column order: these first, any other scraped keys after them alphabetically
+_PRIORITY_COLS = (
+    'player_id', 'version', 'name', 'full_name', 'description', 'image',
+    'height_cm', 'weight_kg', 'dob', 'positions', 'overall_rating', 'potential',
+    'value', 'wage', 'preferred_foot', 'weak_foot', 'skill_moves',
+    'international_reputation', 'body_type', 'real_face',
+    'release_clause', 'specialities', 'club_id', 'club_name', 'club_league_id',
+    'club_league_name', 'club_logo', 'club_rating', 'club_position',
+    'club_kit_number', 'club_joined', 'club_contract_valid_until',
+    'country_id', 'country_name', 'country_league_id', 'country_league_name',
+    'country_flag', 'country_rating', 'country_position', 'country_kit_number',
+    'attacking_crossing', 'attacking_finishing', 'attacking_heading_accuracy',
+    'attacking_short_passing', 'attacking_volleys',
+    'skill_dribbling', 'skill_curve', 'skill_fk_accuracy', 'skill_long_passing',
+    'skill_ball_control',
+    'movement_acceleration', 'movement_sprint_speed', 'movement_agility',
+    'movement_reactions', 'movement_balance',
+    'power_shot_power', 'power_jumping', 'power_stamina', 'power_strength',
+    'power_long_shots',
+    'mentality_aggression', 'mentality_interceptions', 'mentality_att_positioning',
+    'mentality_vision', 'mentality_penalties', 'mentality_composure',
+    'defending_defensive_awareness', 'defending_standing_tackle', 'defending_sliding_tackle',
+    'goalkeeping_gk_diving', 'goalkeeping_gk_handling', 'goalkeeping_gk_kicking',
+    'goalkeeping_gk_positioning', 'goalkeeping_gk_reflexes',
+    'play_styles', 'url'
+)
+_PRIORITY_SET = frozenset(_PRIORITY_COLS)
+
+
+def _parquet_type(col):
+    if col in INT64_COLS:
+        return pa.int64()
+    if col in INT32_COLS:
+        return pa.int32()
+    if col in INT8_COLS or col.startswith(INT8_PREFIXES):
+        return pa.int8()
+    if col in CATEGORY_COLS:
+        return pa.dictionary(pa.int8(), pa.string())
+    return pa.string()
+
+
+def _to_int_array(values, int_type):
+    """Scraped numbers arrive as strings; '' and junk become nulls"""
+    numeric = pc.match_substring_regex(values, r'^\d+(\.\d+)?$')
+    values = pc.if_else(numeric, values, pa.scalar(None, pa.string()))
+    return pc.cast(pc.cast(values, pa.float64()), int_type, safe=False)
+
+
+class ParquetStatsWriter:
+    """Buffers player rows and writes them to a zstd Parquet file in batches"""
+
+    def __init__(self, path, columns, batch_size=1000):
+        if pa is None:
+            raise RuntimeError("pyarrow is required for --format parquet (pip install pyarrow)")
+        self.schema = pa.schema([(col, _parquet_type(col)) for col in columns])
+        self.writer = pq.ParquetWriter(path, self.schema, compression='zstd')
+        self.batch_size = batch_size
+        self.batch = []
+
+    def write(self, stats):
+        self.batch.append(stats)
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered rows; numeric columns are converted per column in Arrow"""
+        if not self.batch:
+            return
+        arrays = []
+        for field in self.schema:
+            values = pa.array(
+                [None if row.get(field.name) is None else str(row[field.name]) for row in self.batch],
+                pa.string()
+            )
+            if pa.types.is_integer(field.type):
+                values = _to_int_array(values, field.type)
+            elif pa.types.is_dictionary(field.type):
+                values = values.dictionary_encode().cast(field.type)
+            arrays.append(values)
+        self.writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema))
+        self.batch = []
+
+    def close(self):
+        self.flush()
+        self.writer.close()
+
+
+class AdaptiveLimiter:
+    """Caps page loads in flight: halves the cap on a challenge, adds one back per clean window
+
+    ``best`` is the last cap a whole window ran at without a challenge (or the
+    starting cap); throttling and forced caps leave it alone, so it is what
+    gets persisted for the next run.
+    """
+
+    def __init__(self, hard_limit, start=None, window=100):
+        self.hard_limit = hard_limit
+        self.limit = max(1, min(start or hard_limit, hard_limit))
+        self.best = self.limit
+        self.window = window
+        self.active = 0
+        self._clean = 0  # Loads since the last challenge
+        self._cond = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+
+    async def __aexit__(self, *exc):
+        async with self._cond:
+            self.active -= 1
+            self._cond.notify_all()
+
+    async def success(self):
+        self._clean += 1
+        if self._clean < self.window:
+            return
+        self._clean = 0
+        self.best = self.limit
+        if self.limit < self.hard_limit:
+            async with self._cond:
+                self.limit += 1
+                self._cond.notify_all()
+
+    def force(self, limit):
+        """Pin the cap for a special pass without touching ``best``"""
+        self._clean = 0
+        self.limit = max(1, min(limit, self.hard_limit))
+
+    def throttle(self, reason):
+        """Back off after a challenge or 429/503; waiters only see the new cap on their next check"""
+        self._clean = 0
+        if self.limit > 1:
+            self.limit //= 2
+            log.warning("  ⚠ %s, lowering concurrency to %d", reason, self.limit)
 
 
 class SoFIFAScraper:
-    def __init__(self, player_urls_file="player_urls.csv", output_file="player_stats.csv"):
+    def __init__(self, player_urls_file="player_urls.csv", output_file="player_stats.csv", use_cache=True, use_http=True,
+                 output_format="csv", max_concurrency=8, resume=True, compress=False):
         # Get current script's directory (e.g., Scrapping/Scripts/)
         current_dir = os.path.dirname(os.path.abspath(__file__))
 
@@ -31,25 +215,258 @@ class SoFIFAScraper:
         # Set absolute file paths
         self.player_urls_file = os.path.join(data_dir, player_urls_file)
         self.output_file = os.path.join(data_dir, output_file)
-        self.player_urls = []
-        self.player_stats = []
+        self.output_format = output_format
+        if output_format != "csv":
+            self.output_file = os.path.splitext(self.output_file)[0] + "." + output_format
+        if output_format == "jsonl" and orjson is None:
+            raise RuntimeError("orjson is required for --format jsonl (pip install orjson)")
+        # CSV/JSONL can be zstd-compressed as they are written; Parquet already is
+        self.compress = compress and output_format != "parquet"
+        if self.compress:
+            if zstandard is None:
+                raise RuntimeError("zstandard is required for --compress (pip install zstandard)")
+            self.output_file += ".zst"
+        self._parquet = None
+        # JSONL output: one orjson line per player, written in binary mode
+        self._jsonl_file = None
+        self.urls_loaded = 0
+        # Rows go straight to the writer; only a count and one sample row are kept
+        self.stats_count = 0
+        self.sample_stats = None
         self.columns = None
-        self.csv_initialized = False
+
+        # CSV output stays open for the whole run; rows are written in batches
+        self._csv_file = None
+        self._csv_writer = None
+        self._csv_buffer = []
+        # Output columns plus keys already reported as dropped
+        self._known_keys = set()
+
+        # Browser cookies (Cloudflare clearance included) are kept between runs
+        self._state_path = os.path.join(data_dir, "cf_state.json")
+        self._state_loaded = False
+
+        # Player page HTML is cached under data/cache so reruns skip the network
+        self.cache = PlayerPageCache(os.path.join(data_dir, "cache")) if use_cache else None
+
+        # Try a plain HTTP/2 fetch before driving the browser to the page
+        self.use_http = use_http
+
+        # Number of player pages scraped in parallel (one browser page each)
+        self.max_concurrency = max_concurrency
+        # How many of them may load at once is tuned during the run and kept for the next one
+        self._limit_path = os.path.join(data_dir, "concurrency.json")
+        self._limiter = None
+
+        # Resume: URLs already in the output CSV/JSONL are skipped and new rows appended
+        # (compressed output is always rewritten)
+        self.resume = resume and output_format in ("csv", "jsonl") and not self.compress
+        self._done = set()
+        # URLs that kept hitting Cloudflare, retried at the end of the run
+        self._deferred = []
+        # True once the output CSV has a header: written by us, or left by a resumed run
+        self._header_written = False
+
+        # Scraped rows are handed to a background writer task so workers never wait on disk
+        self._write_queue = asyncio.Queue()
+        self._writer_task = None
+        # Batch being written in a worker thread; close() must wait for it
+        self._write_future = None
+        # tqdm bar counting the URLs done this run, when progress is shown
+        self._progress = None
 
     def load_player_urls(self):
-        """Load player URLs from CSV file"""
-        print(f"Loading player URLs from {self.player_urls_file}...")
-        with open(self.player_urls_file, 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            next(reader)  # Skip header
-            self.player_urls = [row[0] for row in reader if row]
+        """Get ready to stream player URLs; when resuming, load the URLs already scraped"""
+        print(f"Player URLs will be streamed from {self.player_urls_file}")
+        
+        if not (self.resume and os.path.isfile(self.output_file)):
+            return
+        # New rows are appended, so they must not start on a half-written one
+        self._trim_partial_line()
         
-        print(f"Loaded {len(self.player_urls)} player URLs")
-        return self.player_urls
+        if self.output_format == "jsonl":
+            with open(self.output_file, 'rb') as f:
+                for line in f:
+                    try:
+                        url = orjson.loads(line).get('url')
+                    except orjson.JSONDecodeError:
+                        continue  # Not a complete record
+                    if url:
+                        self._done.add(url)
+            print(f"Resuming: {len(self._done)} players already in {self.output_file}")
+        else:
+            with open(self.output_file, 'r', newline='', encoding='utf-8') as f:
+                reader = csv.DictReader(f)
+                self._done = {row['url'] for row in reader if row.get('url')}
+                if reader.fieldnames:
+                    self.columns = reader.fieldnames
+                    self._header_written = True
+            print(f"Resuming: {len(self._done)} players already in {self.output_file}")
 
-    async def scrape_player_stats(self, max_players=None):
-        """Scrape detailed stats for each player"""
-        async with async_playwright() as p:
+    def _trim_partial_line(self):
+        """Cut the output back to its last newline, dropping a row an interrupted run left unfinished"""
+        with open(self.output_file, 'rb+') as f:
+            end = pos = f.seek(0, os.SEEK_END)
+            while pos > 0:
+                step = min(pos, 1 << 16)
+                f.seek(pos - step)
+                newline = f.read(step).rfind(b'\n')
+                if newline != -1:
+                    pos += newline + 1 - step
+                    break
+                pos -= step
+            if pos != end:
+                f.truncate(pos)
+                log.warning("Dropped %d bytes of an unfinished row at the end of %s", end - pos, self.output_file)
+
+    def iter_player_urls(self):
+        """Yield player URLs from the CSV as they are read, skipping ones already scraped"""
+        with open(self.player_urls_file, 'r', newline='', encoding='utf-8', buffering=1 << 20) as f:
+            reader = csv.reader(f)
+            next(reader, None)  # Skip header
+            for row in reader:
+                if row and row[0] not in self._done:
+                    self.urls_loaded += 1
+                    yield row[0]
+
+    async def _worker(self, queue, pages, http_client, defer):
+        """Scrape queued (idx, url) pairs until a None sentinel arrives"""
+        while (item := await queue.get()) is not None:
+            idx, url = item
+            await self._scrape_one(pages, http_client, url, idx, defer)
+
+    @staticmethod
+    async def _produce(queue, urls, n_workers):
+        """Feed URLs to the workers, then one sentinel per worker"""
+        for item in enumerate(urls, 1):
+            await queue.put(item)
+        for _ in range(n_workers):
+            await queue.put(None)
+
+    async def _run_workers(self, pages, http_client, urls, defer=True):
+        """Scrape `urls` with a fixed pool of workers sharing the browser pages"""
+        queue = asyncio.Queue(maxsize=2 * self.max_concurrency)
+        workers = [
+            asyncio.create_task(self._worker(queue, pages, http_client, defer))
+            for _ in range(self.max_concurrency)
+        ]
+        try:
+            await self._produce(queue, urls, len(workers))
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+    async def _scrape_one(self, pages, http_client, url, idx, defer=True):
+        """Scrape one player on a page borrowed from the pool, with retries
+
+        Network errors and empty pages are retried up to 5 times, but a URL
+        that keeps getting challenged is deferred (or, on its deferred pass,
+        skipped) after CF_HITS_BEFORE_DEFER challenges.
+        """
+        page = await pages.get()
+        try:
+            retries = 0
+            max_retries = 5
+            cf_hits = 0
+            
+            while retries < max_retries:
+                try:
+                    if retries > 0:
+                        # Exponential backoff with jitter: short for blips, long against rate limits
+                        backoff = min(60, 2 ** retries + random.random())
+                        log.info("  Retry %d/%d for %s after %.1fs pause...", retries, max_retries, url, backoff)
+                        await asyncio.sleep(backoff)
+                    
+                    log.info("[%d] Scraping player: %s", idx, url)
+                
+                    async with self._limiter:
+                        source, html = await PlayerScraper.load_page(page, url, self.cache, http_client)
+                    if source == 'rate_limited':
+                        # Plain 429/503: slow down, but the saved clearance is still valid
+                        log.warning("  ⚠ Rate limited on %s", url)
+                        self._limiter.throttle("Rate limited")
+                        retries += 1
+                        continue
+                    
+                    # 403 or cf-mitigated header on the navigation response
+                    challenged = source == 'cloudflare'
+                    if source == 'cache':
+                        log.debug("  ↺ Loaded from cache")
+                    elif source == 'browser':
+                        # Wait for the player name the extractor needs instead of a fixed delay
+                        try:
+                            await page.wait_for_selector('h1.ellipsis', state='attached', timeout=5000)
+                        except PlaywrightTimeoutError:
+                            # No name: a challenge served with 200 shows up in the title
+                            title = await page.title()
+                            challenged = any(marker in title for marker in CLOUDFLARE_MARKERS)
+                    
+                    if challenged:
+                        log.warning("  ⚠ Cloudflare challenge detected on %s", url)
+                        self._limiter.throttle("Cloudflare challenge")
+                        await self._drop_stale_state(page.context)
+                        cf_hits += 1
+                        if cf_hits >= CF_HITS_BEFORE_DEFER:
+                            break  # Blocked, not flaky: more retries would only burn backoff
+                        retries += 1
+                        continue
+                    
+                    # Extract player stats using modular scraper
+                    ok, stats = await PlayerScraper.scrape_player_data(page, url)
+                    
+                    if ok:
+                        self.stats_count += 1
+                        if self.sample_stats is None:
+                            self.sample_stats = stats
+                        # Saved incrementally by the writer task
+                        self._write_queue.put_nowait(stats)
+                        log.info("  ✓ Extracted: %s (ID: %s)", stats['name'], stats['player_id'])
+                        if source != 'cache':
+                            await self._limiter.success()
+                            await self._cache_page(page, url, html)
+                        return
+                    
+                    log.info("  ✗ No data extracted from %s", url)
+                    retries += 1
+                        
+                except Exception as e:
+                    log.warning("  ✗ Error on %s: %s", url, e)
+                    retries += 1
+            
+            if cf_hits >= CF_HITS_BEFORE_DEFER:
+                if defer:
+                    log.warning("  ⏸ %s keeps getting challenged, deferring it to the end of the run", url)
+                    self._deferred.append(url)
+                    return
+                log.warning("  ✗ %s is still challenged, skipping...", url)
+            else:
+                log.warning("  ✗ Failed %s after %d retries, skipping...", url, max_retries)
+            if self._progress is not None:
+                self._progress.update(1)
+        finally:
+            pages.put_nowait(page)
+
+    async def _cache_page(self, page, url, html=None):
+        """Cache a page that produced data; the row is already saved, so failures are only logged"""
+        if not self.cache:
+            return
+        try:
+            # HTTP responses are cached as fetched; only browser pages need their DOM pulled over IPC
+            if html is None:
+                html = await page.content()
+            # gzip + rename in a thread so other workers keep running
+            await asyncio.to_thread(self.cache.put, url, html)
+        except Exception as e:
+            log.warning("  ⚠ Could not cache %s: %s", url, e)
+
+    async def scrape_player_stats(self, max_players=None, progress=False):
+        """Scrape detailed stats for each player, max_concurrency pages at a time"""
+        if progress:
+            # URLs are streamed, so there is no total unless the run is capped
+            self._progress = tqdm(total=max_players, unit="player")
+        async with async_playwright() as p, new_http_client() as client:
+            http_client = client if self.use_http else None
             browser = await p.chromium.launch(
                 headless=True,
                 args=[
@@ -60,132 +477,196 @@ class SoFIFAScraper:
                 ]
             )
             
+            # Start from the previous run's cookies so Cloudflare is usually already passed
+            self._state_loaded = os.path.isfile(self._state_path)
             context = await browser.new_context(
-                user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                storage_state=self._state_path if self._state_loaded else None,
+                user_agent=USER_AGENT,
                 viewport={'width': 1920, 'height': 1080},
                 locale='en-US',
                 timezone_id='America/New_York',
-                extra_http_headers={
-                    'Accept-Language': 'en-US,en;q=0.9',
-                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-                    'Sec-Fetch-Dest': 'document',
-                    'Sec-Fetch-Mode': 'navigate',
-                    'Sec-Fetch-Site': 'none'
-                }
+                extra_http_headers=EXTRA_HEADERS
             )
             
-            page = await context.new_page()
+            # Block images, stylesheets, fonts and trackers for all pages of the context
+            await PlayerScraper.block_resources(context)
+            await PlayerScraper.install_extractor(context)
+            
+            # Pages of the shared context, handed out to workers one at a time
+            pages = asyncio.Queue()
+            for _ in range(self.max_concurrency):
+                pages.put_nowait(await context.new_page())
             
-            # Block images, stylesheets, fonts to optimize loading
-            await page.route("**/*", lambda route: route.abort() if route.request.resource_type in ["image", "stylesheet", "font", "media"] else route.continue_())
+            self._limiter = AdaptiveLimiter(self.max_concurrency, self._load_concurrency())
             
-            urls_to_scrape = self.player_urls[:max_players] if max_players else self.player_urls
-            total = len(urls_to_scrape)
+            self._writer_task = asyncio.create_task(self._writer_loop())
             
-            for idx, url in enumerate(urls_to_scrape, 1):
-                retries = 0
-                max_retries = 5
-                success = False
+            try:
+                # URLs are streamed from the CSV to a fixed pool of workers
+                urls = itertools.islice(self.iter_player_urls(), max_players)
+                await self._run_workers(pages, http_client, urls)
                 
-                while retries < max_retries and not success:
-                    try:
-                        if retries > 0:
-                            print(f"  Retry {retries}/{max_retries} after 10s pause...")
-                            await asyncio.sleep(10)
-                        
-                        print(f"\n[{idx}/{total}] Scraping player: {url}")
-                    
-                        await page.goto(url, wait_until="domcontentloaded", timeout=15000)
-                        await page.wait_for_timeout(2000)
-                        
-                        # Check for Cloudflare challenge
-                        page_content = await page.content()
-                        if 'Checking your browser' in page_content or 'Just a moment' in page_content or 'cf-browser-verification' in page_content:
-                            print("  ⚠ Cloudflare challenge detected")
-                            retries += 1
-                            continue
-                        
-                        # Extract player stats using modular scraper
-                        stats = await PlayerScraper.scrape_player_data(page, url)
-                        
-                        if stats.get('name'):
-                            self.player_stats.append(stats)
-                            print(f"  ✓ Extracted: {stats.get('name', 'Unknown')} (ID: {stats.get('player_id', 'N/A')})")
-                            # Save incrementally after each player
-                            self.save_player_to_csv(stats)
-                            success = True
-                        else:
-                            print("  ✗ No data extracted")
-                            retries += 1
-                            
-                    except Exception as e:
-                        print(f"  ✗ Error: {str(e)}")
-                        retries += 1
+                # One more, single-file pass over blocked URLs once Cloudflare has cooled down
+                if self._deferred:
+                    deferred, self._deferred = self._deferred, []
+                    log.warning("%d players deferred after repeated challenges, retrying them in %ds",
+                                len(deferred), DEFER_COOLDOWN)
+                    await asyncio.sleep(DEFER_COOLDOWN)
+                    self._limiter.force(1)
+                    await self._run_workers(pages, http_client, deferred, defer=False)
                 
-                if not success:
-                    print(f"  ✗ Failed after {max_retries} retries, skipping...")
-            
-            await browser.close()
+                # Let the writer drain what the workers queued
+                await self._write_queue.join()
+            finally:
+                self._writer_task.cancel()
+                await asyncio.gather(self._writer_task, return_exceptions=True)
+                # Let a batch still being written in its thread finish before closing the file
+                if self._write_future is not None:
+                    await asyncio.gather(self._write_future, return_exceptions=True)
+                self.close()
+                if self._progress is not None:
+                    self._progress.close()
+                    self._progress = None
+                self._save_concurrency()
+                # Only a run that got player pages has cookies worth keeping
+                if self.stats_count:
+                    await context.storage_state(path=self._state_path)
+                await browser.close()
+
+    def _load_concurrency(self):
+        """Last clean concurrency of the previous run, or None to start at max_concurrency"""
+        try:
+            with open(self._limit_path, 'r', encoding='utf-8') as f:
+                return int(json.load(f)['concurrency'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save_concurrency(self):
+        """Keep the last cap that ran clean, not one lowered by throttling or the deferred pass"""
+        with open(self._limit_path, 'w', encoding='utf-8') as f:
+            json.dump({'concurrency': self._limiter.best}, f)
+
+    async def _drop_stale_state(self, context):
+        """A challenge despite saved cookies means they expired: forget them once"""
+        if not self._state_loaded:
+            return
+        self._state_loaded = False
+        log.warning("  ⚠ Saved browser state is stale, clearing cookies")
+        await context.clear_cookies()
+        if os.path.isfile(self._state_path):
+            os.remove(self._state_path)
+
+    async def _writer_loop(self):
+        """Write queued rows in batches, off the event loop, while workers wait on the network"""
+        while True:
+            batch = [await self._write_queue.get()]
+            # Take whatever else piled up during the last write
+            while len(batch) < CSV_FLUSH_EVERY and not self._write_queue.empty():
+                batch.append(self._write_queue.get_nowait())
+            # Shielded: cancelling the writer must not close the file under a running write
+            self._write_future = asyncio.ensure_future(asyncio.to_thread(self._write_batch, batch))
+            try:
+                await asyncio.shield(self._write_future)
+            except Exception as e:
+                log.error("  ✗ Failed to save %d players: %s", len(batch), e)
+            finally:
+                for _ in batch:
+                    self._write_queue.task_done()
+                # Progress is reported here so workers never touch the terminal
+                if self._progress is not None:
+                    self._progress.update(len(batch))
+
+    def _write_batch(self, batch):
+        """Save a batch of players; CSV and JSONL rows go out in one write + flush"""
+        if self.output_format == "jsonl":
+            self._write_jsonl(batch)
+            return
+        for stats in batch:
+            self.save_player(stats)
+        if self._csv_buffer:
+            self._flush_csv()
 
     def _get_column_order(self, stats_dict):
-        """Define and return the column order for CSV"""
-        priority_cols = [
-            'player_id', 'version', 'name', 'full_name', 'description', 'image',
-            'height_cm', 'weight_kg', 'dob', 'positions', 'overall_rating', 'potential',
-            'value', 'wage', 'preferred_foot', 'weak_foot', 'skill_moves',
-            'international_reputation', 'body_type', 'real_face',
-            'release_clause', 'specialities', 'club_id', 'club_name', 'club_league_id',
-            'club_league_name', 'club_logo', 'club_rating', 'club_position',
-            'club_kit_number', 'club_joined', 'club_contract_valid_until',
-            'country_id', 'country_name', 'country_league_id', 'country_league_name',
-            'country_flag', 'country_rating', 'country_position', 'country_kit_number',
-            'attacking_crossing', 'attacking_finishing', 'attacking_heading_accuracy', 
-            'attacking_short_passing', 'attacking_volleys',
-            'skill_dribbling', 'skill_curve', 'skill_fk_accuracy', 'skill_long_passing', 
-            'skill_ball_control',
-            'movement_acceleration', 'movement_sprint_speed', 'movement_agility', 
-            'movement_reactions', 'movement_balance',
-            'power_shot_power', 'power_jumping', 'power_stamina', 'power_strength', 
-            'power_long_shots',
-            'mentality_aggression', 'mentality_interceptions', 'mentality_att_positioning', 
-            'mentality_vision', 'mentality_penalties', 'mentality_composure',
-            'defending_defensive_awareness', 'defending_standing_tackle', 'defending_sliding_tackle',
-            'goalkeeping_gk_diving', 'goalkeeping_gk_handling', 'goalkeeping_gk_kicking', 
-            'goalkeeping_gk_positioning', 'goalkeeping_gk_reflexes',
-            'play_styles', 'url'
-        ]
-        
-        # Add priority columns first, then any additional columns
-        all_keys = set(stats_dict.keys())
-        other_cols = sorted([col for col in all_keys if col not in priority_cols])
-        columns = [col for col in priority_cols if col in all_keys] + other_cols
-        return columns
+        """Define and return the column order for CSV/Parquet"""
+        # Every priority column, even if this row lacks it (national team fields
+        # are often missing), then any additional keys of the row
+        return list(_PRIORITY_COLS) + sorted(stats_dict.keys() - _PRIORITY_SET)
     
-    def save_player_to_csv(self, stats):
-        """Save a single player's stats to CSV file incrementally"""
+    def save_player(self, stats):
+        """Write one player's stats in the configured output format"""
+        if self.output_format == "parquet":
+            if self._parquet is None:
+                self.columns = self._get_column_order(stats)
+                self._parquet = ParquetStatsWriter(self.output_file, self.columns)
+                self._known_keys = set(self.columns)
+            self._warn_dropped(stats)
+            self._parquet.write(stats)
+        elif self.output_format == "jsonl":
+            self._write_jsonl([stats])
+        else:
+            self.save_player_to_csv(stats)
 
+    def _open_output(self, mode):
+        """Open the output file for writing, through a zstd stream with --compress"""
+        if not self.compress:
+            if 'b' in mode:
+                return open(self.output_file, mode)
+            return open(self.output_file, mode, newline='', encoding='utf-8', buffering=1 << 20)
+        # Closing the returned file ends the zstd frame and closes the raw file
+        raw = open(self.output_file, mode[0] + 'b')
+        fh = zstandard.ZstdCompressor(level=3, threads=-1).stream_writer(raw)
+        return fh if 'b' in mode else io.TextIOWrapper(fh, encoding='utf-8', newline='')
+
+    def _write_jsonl(self, batch):
+        """Append players as JSON lines; no header or column order to maintain"""
+        if self._jsonl_file is None:
+            self._jsonl_file = self._open_output('ab' if self.resume else 'wb')
+        self._jsonl_file.write(b''.join(orjson.dumps(stats, option=orjson.OPT_APPEND_NEWLINE) for stats in batch))
+        self._jsonl_file.flush()
+
+    def close(self):
+        """Flush any rows still buffered and close the output file"""
+        if self._parquet is not None:
+            self._parquet.close()
+            self._parquet = None
+        if self._csv_file is not None:
+            self._flush_csv()
+            self._csv_file.close()
+            self._csv_file = self._csv_writer = None
+        if self._jsonl_file is not None:
+            self._jsonl_file.close()
+            self._jsonl_file = None
+
+    def save_player_to_csv(self, stats):
+        """Buffer a player's stats; the writer task flushes them once per batch"""
+        # Open the file and build its DictWriter once, when the columns are known
+        if self._csv_writer is None:
+            if not self._header_written:
+                self.columns = self._get_column_order(stats)
+            # A resumed run appends under the header already in the file
+            mode = 'a' if self._header_written else 'w'
+            self._csv_file = self._open_output(mode)
+            # Keys outside the columns are dropped (and reported) instead of raising
+            self._csv_writer = csv.DictWriter(self._csv_file, fieldnames=self.columns, extrasaction='ignore')
+            if not self._header_written:
+                self._csv_writer.writeheader()
+                self._header_written = True
+            self._known_keys = set(self.columns)
         
-        # Check if file exists
-        file_exists = os.path.isfile(self.output_file) and self.csv_initialized
-        
-        # Initialize columns on first write
-        if self.columns is None:
-            self.columns = self._get_column_order(stats)
-        
-        # Write to CSV
-        mode = 'a'
-        if not self.csv_initialized:
-            mode = 'w'
-            self.csv_initialized = True
-
-        with open(self.output_file, mode, newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=self.columns)
-            
-            # Write header only if file doesn't exist
-            if not file_exists:
-                writer.writeheader()
-            
-            writer.writerow(stats)
+        self._warn_dropped(stats)
+        self._csv_buffer.append(stats)
+
+    def _warn_dropped(self, stats):
+        """Columns are fixed once the file is open; report keys that don't fit, once each"""
+        dropped = stats.keys() - self._known_keys
+        if dropped:
+            self._known_keys |= dropped
+            log.warning("Not in the columns of %s, dropped: %s", self.output_file, ', '.join(sorted(dropped)))
+
+    def _flush_csv(self):
+        self._csv_writer.writerows(self._csv_buffer)
+        self._csv_file.flush()
+        self._csv_buffer.clear()
 
 
 def parse_args():
@@ -207,15 +688,60 @@ def parse_args():
         default="player_stats.csv",
         help="Path to the CSV file for saving player stats"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always fetch player pages instead of reading them from data/cache"
+    )
+    parser.add_argument(
+        "--browser-only",
+        action="store_true",
+        help="Skip the plain HTTP fetch and load every player page in the browser"
+    )
+    parser.add_argument(
+        "--format",
+        choices=["csv", "parquet", "jsonl"],
+        default="csv",
+        help="Output format for player stats (parquet needs pyarrow, jsonl needs orjson)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Number of player pages scraped in parallel (lowered automatically while rate limited)"
+    )
+    parser.add_argument(
+        "--resume",
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help="Skip players already in the output CSV/JSONL and append to it (--no-resume starts over)"
+    )
+    parser.add_argument(
+        "--compress",
+        action="store_true",
+        help="Write CSV/JSONL output zstd-compressed to <output-file>.zst (needs zstandard, never resumes)"
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Log every player scraped instead of showing a progress bar"
+    )
     return parser.parse_args()
 
 
 async def main():
     """Main function to run the scraper"""
     args = parse_args()
+    logging.basicConfig(format="%(message)s", level=logging.INFO if args.verbose else logging.WARNING)
     scraper = SoFIFAScraper(
         player_urls_file=args.player_urls_file,
-        output_file=args.output_file
+        output_file=args.output_file,
+        use_cache=not args.no_cache,
+        use_http=not args.browser_only,
+        output_format=args.format,
+        max_concurrency=args.concurrency,
+        resume=args.resume,
+        compress=args.compress
     )
     
     # Load player URLs from CSV file
@@ -229,29 +755,30 @@ async def main():
     print("Scraping detailed stats for each player")
     print("="*60)
     
-    print(f"\nTotal players to scrape: {len(scraper.player_urls)}")
-    print("Note: Scraping all players may take a long time.")
+    print("\nNote: Scraping all players may take a long time.")
     
     # Set to None to scrape all players, or set a number to limit
     if args.max_players:
         print(f"Limiting to first {args.max_players} players...")
     
-    await scraper.scrape_player_stats(max_players=args.max_players)
+    # Warnings are printed through tqdm so they don't break the progress bar
+    with logging_redirect_tqdm():
+        await scraper.scrape_player_stats(max_players=args.max_players, progress=not args.verbose)
     
     # Print summary
     print("\n" + "="*60)
     print("SCRAPING COMPLETED!")
     print("="*60)
-    print(f"Total player URLs loaded: {len(scraper.player_urls)}")
-    print(f"Total player stats scraped: {len(scraper.player_stats)}")
+    print(f"Total player URLs loaded: {scraper.urls_loaded}")
+    print(f"Total player stats scraped: {scraper.stats_count}")
     print("\nFile created:")
-    print("  - player_stats.csv (detailed stats for all players)")
+    print(f"  - {os.path.basename(scraper.output_file)} (detailed stats for all players)")
     
     # Show sample of stats columns
-    if scraper.player_stats:
-        print(f"\nSample player: {scraper.player_stats[0].get('name', 'Unknown')}")
-        print(f"Stats columns: {len(scraper.player_stats[0])} total")
-        stat_cols = list(scraper.player_stats[0].keys())
+    if scraper.sample_stats:
+        print(f"\nSample player: {scraper.sample_stats.get('name', 'Unknown')}")
+        print(f"Stats columns: {len(scraper.sample_stats)} total")
+        stat_cols = list(scraper.sample_stats.keys())
         print(f"First 10 columns: {', '.join(stat_cols[:10])}")
 
 